@@ -0,0 +1,97 @@
+"""
+Bounded per-session conversation history for the context resolver.
+
+Each session keeps the last HISTORY_MAX_TURNS user/agent exchanges as a
+list of {"role", "content"} entries in its session state (a ring buffer:
+appending past the cap drops the oldest entry). When the rephrase prompt is
+built, entries are taken newest first until HISTORY_TOKEN_BUDGET is spent;
+any single message longer than HISTORY_MESSAGE_TOKENS is compacted to its
+opening (the part of an agent reply that names what it is about) first.
+
+Token counts are estimated from character classes rather than a real
+tokenizer - close enough to keep prompt sizes bounded and predictable.
+"""
+
+import math
+import os
+
+HISTORY_MAX_TURNS = int(os.environ.get("HISTORY_MAX_TURNS", "6"))
+HISTORY_TOKEN_BUDGET = int(os.environ.get("HISTORY_TOKEN_BUDGET", "600"))
+HISTORY_MESSAGE_TOKENS = int(os.environ.get("HISTORY_MESSAGE_TOKENS", "150"))
+
+ROLE_LABELS = {"user": "User", "agent": "Agent"}
+
+# Rough characters per token: Latin text ~4, Hebrew and other scripts ~2
+_ASCII_CHARS_PER_TOKEN = 4
+_OTHER_CHARS_PER_TOKEN = 2
+
+_ELLIPSIS = " …"
+
+
+def estimate_tokens(text: str | None) -> int:
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    other_chars = len(text) - ascii_chars
+    return math.ceil(ascii_chars / _ASCII_CHARS_PER_TOKEN + other_chars / _OTHER_CHARS_PER_TOKEN)
+
+
+def compact(text: str, max_tokens: int = HISTORY_MESSAGE_TOKENS) -> str:
+    """Cut `text` to about `max_tokens`, on a word boundary where possible."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Binary search the longest prefix that fits
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+
+    cut = text[:lo]
+    space = cut.rfind(" ")
+    if space > lo // 2:
+        cut = cut[:space]
+    return cut.rstrip() + _ELLIPSIS
+
+
+def append(history: list | None, role: str, content: str, max_turns: int = HISTORY_MAX_TURNS) -> list:
+    """Return a new history with the entry added and the oldest dropped past the cap."""
+    entries = list(history or [])
+    entries.append({"role": role, "content": content})
+    return entries[-max_turns * 2:] if max_turns > 0 else []
+
+
+def window(
+    history: list | None,
+    budget: int = HISTORY_TOKEN_BUDGET,
+    message_tokens: int = HISTORY_MESSAGE_TOKENS,
+) -> list:
+    """
+    The most recent entries that fit in `budget` tokens, oldest first, with
+    long messages compacted. The newest entry is always kept.
+    """
+    selected = []
+    spent = 0
+    for entry in reversed(history or []):
+        content = compact(entry["content"], message_tokens)
+        cost = estimate_tokens(content)
+        if selected and spent + cost > budget:
+            break
+        selected.append({"role": entry["role"], "content": content})
+        spent += cost
+    selected.reverse()
+    return selected
+
+
+def format_history(entries: list) -> str:
+    return "\n".join(
+        f"{ROLE_LABELS.get(e['role'], e['role'])}: {e['content']}" for e in entries
+    )
+
+
+def history_text(history: list | None) -> str:
+    """Plain text of the windowed history, for entity lookups."""
+    return " ".join(e["content"] for e in window(history))
@@ -0,0 +1,97 @@
+"""
+Prewritten answers for workflows whose output never varies.
+
+Greetings, the fallback menu, the safety redirect and the out-of-scope
+(UNKNOWN) reply are the same text every time, so they are streamed
+straight from these templates instead of through an LLM call. The
+language follows the user's preferred_lang.
+
+DIRECT_RESPONSE_WORKFLOWS lists the workflows answered this way
+(workflow module names, plus "unknown"); "" sends everything to the LLM.
+"""
+
+import os
+
+from agents.agent_utils.language import detect_language
+
+DIRECT_RESPONSE_WORKFLOWS = frozenset(
+    name.strip()
+    for name in os.environ.get(
+        "DIRECT_RESPONSE_WORKFLOWS", "greetings,fallback,safety_redirect,unknown"
+    ).split(",")
+    if name.strip()
+)
+
+TEMPLATES = {
+    "greetings": {
+        "en": (
+            "Hello! I'm the pharmacy assistant. I can give you factual information "
+            "about medications, check availability in our stores, and help with "
+            "your prescriptions and refills. How can I help?"
+        ),
+        "he": (
+            "שלום! אני העוזר הדיגיטלי של בית המרקחת. אפשר לשאול אותי על תרופות, "
+            "לבדוק זמינות במלאי בסניפים ולקבל עזרה במרשמים ובחידושים. איך אפשר לעזור?"
+        ),
+    },
+    "fallback": {
+        "en": (
+            "I'm not sure I understood your request. I can help with:\n"
+            "- Medication information\n"
+            "- Active ingredients\n"
+            "- Prescription requirements\n"
+            "- Stock availability\n"
+            "- Prescription refill status\n\n"
+            "Could you rephrase or clarify your question?"
+        ),
+        "he": (
+            "לא בטוח שהבנתי את הבקשה. אני יכול לעזור ב:\n"
+            "- מידע על תרופות\n"
+            "- חומרים פעילים\n"
+            "- דרישות מרשם\n"
+            "- זמינות במלאי\n"
+            "- סטטוס חידוש מרשם\n\n"
+            "אפשר לנסח מחדש או לפרט את השאלה?"
+        ),
+    },
+    "safety_redirect": {
+        "en": (
+            "I can provide general factual information about medications, but I can't "
+            "give medical advice or treatment recommendations. Please consult a licensed "
+            "pharmacist or doctor, or your local GP at 050-000-000.\n\n"
+            "I can share the label information for a medication, or check its "
+            "prescription requirements and availability."
+        ),
+        "he": (
+            "אני יכול לספק מידע עובדתי כללי על תרופות, אך לא לתת ייעוץ רפואי או המלצות "
+            "טיפול. מומלץ להתייעץ עם רוקח/ת או רופא/ה, או עם רופא המשפחה בטלפון 050-000-000.\n\n"
+            "אשמח למסור את המידע שמופיע בעלון התרופה, או לבדוק דרישות מרשם וזמינות."
+        ),
+    },
+    "unknown": {
+        "en": (
+            "Sorry, I can only help with pharmacy-related questions, such as "
+            "medications, prescriptions, or availability."
+        ),
+        "he": (
+            "מצטער, אני יכול לעזור רק בשאלות שקשורות לבית המרקחת, כמו מידע על תרופות, "
+            "מרשמים או זמינות במלאי."
+        ),
+    },
+}
+
+
+def template_language(preferred_lang: str | None, message: str) -> str:
+    """The user's preferred_lang when a template exists for it, else the message's language."""
+    lang = (preferred_lang or "").strip().lower()
+    return lang if lang in ("en", "he") else detect_language(message)
+
+
+def get_direct_response(workflow: str, lang: str) -> str | None:
+    """Template answer for `workflow`, or None when it should go to the LLM."""
+    if workflow not in DIRECT_RESPONSE_WORKFLOWS:
+        return None
+    templates = TEMPLATES.get(workflow)
+    if not templates:
+        return None
+    return templates.get(lang) or templates["en"]
@@ -0,0 +1,17 @@
+"""
+Detect whether a message is Hebrew or English.
+"""
+
+
+def detect_language(text: str, default: str = "en") -> str:
+    """'he' or 'en' by majority script; `default` when the text has no letters."""
+    hebrew = latin = 0
+    for ch in text or "":
+        if "א" <= ch <= "ת":
+            hebrew += 1
+        elif ch.isascii() and ch.isalpha():
+            latin += 1
+
+    if not hebrew and not latin:
+        return default
+    return "he" if hebrew >= latin else "en"
@@ -0,0 +1,30 @@
+"""
+Shared AsyncOpenAI client, created on first use.
+
+Importing the openai SDK is slow, and nothing outside the chat pipeline
+needs it, so neither the import nor the client happens at module load.
+"""
+
+import os
+import threading
+
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_llm_client():
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                from openai import AsyncOpenAI
+
+                _CLIENT = AsyncOpenAI(api_key=os.environ["OPENAI_API_KEY"])
+    return _CLIENT
+
+
+async def close_llm_client():
+    global _CLIENT
+    client, _CLIENT = _CLIENT, None
+    if client is not None:
+        await client.close()
@@ -0,0 +1,78 @@
+"""
+Cheap local check deciding whether a message needs LLM rephrasing at all.
+
+Rephrasing only helps when the message leans on the previous turn - a
+pronoun ("is it in stock?"), an elliptical follow-up ("and in Haifa?") or
+an implied medication from earlier in the conversation. A message that
+names its own medication and refers to nothing is sent on unchanged.
+"""
+
+import os
+
+from agents.agent_utils.conversation_history import history_text
+from utils.medication.catalog import HEBREW_PREFIXES, get_catalog, normalize
+
+REPHRASE_GATE_ENABLED = os.environ.get("REPHRASE_GATE_ENABLED", "1") != "0"
+
+# Messages this short with no medication are treated as elliptical follow-ups
+SHORT_MESSAGE_WORDS = 3
+
+REFERENCE_WORDS_EN = frozenset({
+    "it", "its", "itself", "this", "that", "these", "those", "they", "them",
+    "their", "he", "him", "his", "she", "her", "one", "ones", "same", "such",
+})
+
+REFERENCE_WORDS_HE = frozenset({
+    "זה", "זו", "זאת", "הוא", "היא", "הם", "הן", "אותו", "אותה", "אותם", "אותן",
+    "ממנו", "ממנה", "מהם", "שלו", "שלה", "שלהם", "בו", "בה", "לו", "לה", "עליו",
+    "עליה", "איתו", "איתה", "כזה", "כזאת", "האלה", "ההוא", "ההיא", "אלה", "אלו",
+})
+
+# Openings that continue the previous question ("and ...", "what about ...")
+CONTINUATION_PREFIXES = (
+    "and ", "also ", "what about ", "how about ", "same ",
+    "ומה ", "מה לגבי ", "וגם ", "גם ", "ואם ", "ובסניף ",
+)
+
+
+def _is_reference(word: str) -> bool:
+    if word in REFERENCE_WORDS_EN or word in REFERENCE_WORDS_HE:
+        return True
+    # Hebrew glues one-letter prefixes onto pronouns ("וזה", "בזה")
+    return len(word) > 2 and word[0] in HEBREW_PREFIXES and word[1:] in REFERENCE_WORDS_HE
+
+
+def needs_rephrase(message: str, session_context: dict) -> tuple[bool, str]:
+    """
+    Decide whether `message` should go through the rephrase LLM call.
+
+    Returns (needed, reason); the reason is used for logging and metrics.
+    """
+    prev_user = session_context.get("user_message")
+    prev_agent = session_context.get("agent_message")
+    if not prev_user and not prev_agent:
+        return False, "no_context"
+
+    if not REPHRASE_GATE_ENABLED:
+        return True, "gate_disabled"
+
+    text = normalize(message)
+    words = text.split()
+
+    if any(_is_reference(w) for w in words):
+        return True, "reference"
+    if (text + " ").startswith(CONTINUATION_PREFIXES):
+        return True, "continuation"
+
+    catalog = get_catalog()
+    if catalog.find_all(text):
+        return False, "self_contained"
+    if len(words) <= SHORT_MESSAGE_WORDS:
+        return True, "ellipsis"
+
+    # Without a medication of its own, the message can only borrow one from context
+    history = session_context.get("history")
+    context = history_text(history) if history else f"{prev_user or ''} {prev_agent or ''}"
+    if catalog.find_all(context):
+        return True, "implicit_entity"
+    return False, "nothing_to_resolve"
@@ -2,42 +2,90 @@
 Rephrase user questions by resolving ambiguous pronouns using conversation context
 """
 
-from openai import OpenAI
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING
+
+from agents.agent_utils.conversation_history import (
+    HISTORY_MESSAGE_TOKENS,
+    compact,
+    estimate_tokens,
+    format_history,
+    window,
+)
+from utils.cache.lru import TTLCache
 from utils.logging_utils.workflow_logger import get_workflow_logger
+from utils.metrics.registry import METRICS
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+REPHRASE_MODEL = "gpt-5"
+
+# Identical (conversation context, current message) pairs rephrase identically
+_REPHRASE_CACHE = TTLCache(
+    max_entries=int(os.environ.get("REPHRASE_CACHE_ENTRIES", "4096")),
+    ttl_seconds=float(os.environ.get("REPHRASE_CACHE_TTL_SECONDS", "3600")),
+    max_bytes=int(os.environ.get("REPHRASE_CACHE_MAX_MB", "8")) * 1024 * 1024,
+)
+
+
+# Buckets for the estimated size of the conversation part of the prompt
+PROMPT_TOKEN_BUCKETS = (50, 100, 200, 300, 400, 600, 800, 1200, 1600)
+
+
+def _cache_key(context: str, current_message: str) -> str:
+    raw = json.dumps([REPHRASE_MODEL, context, current_message.strip()], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
-def rephrase_with_context(
-    client: OpenAI,
+def rephrase_cache_stats() -> dict:
+    return _REPHRASE_CACHE.stats()
+
+
+async def rephrase_with_context(
+    client: "AsyncOpenAI",
     current_message: str,
     previous_user_message: str | None = None,
     previous_agent_message: str | None = None,
-    user_id: str | None = None
+    user_id: str | None = None,
+    history: list | None = None,
 ) -> str:
     """
     Rephrase user message by resolving ambiguous pronouns (it, that, this, they, etc.)
-    using previous user message and agent response for context.
+    using the recent conversation history, or the previous user message and
+    agent response when no history is given. Either way the context is cut
+    to a fixed token budget.
     """
     logger = get_workflow_logger(user_id)
 
-    if not previous_user_message and not previous_agent_message:
+    if history:
+        entries = window(history)
+        context = f"Conversation so far (oldest first):\n{format_history(entries)}\n\n"
+    elif previous_user_message or previous_agent_message:
+        context = ""
+        if previous_agent_message:
+            context += f"Agent's last response:\n{compact(previous_agent_message, HISTORY_MESSAGE_TOKENS)}\n\n"
+        if previous_user_message:
+            context += f"Your previous question:\n{compact(previous_user_message, HISTORY_MESSAGE_TOKENS)}\n\n"
+    else:
         return current_message
 
-    # Truncate long messages to avoid token overflow
-    max_length = 300
-    prev_user = previous_user_message[-max_length:] if previous_user_message and len(previous_user_message) > max_length else previous_user_message
-    prev_agent = previous_agent_message[-max_length:] if previous_agent_message and len(previous_agent_message) > max_length else previous_agent_message
+    key = _cache_key(context, current_message)
+    cached = _REPHRASE_CACHE.get(key)
+    if cached is not None:
+        logger.info(f"Rephrase cache hit: {current_message[:80]}")
+        return cached
 
     try:
-        context = ""
-        if prev_agent:
-            context += f"Agent's last response:\n{prev_agent}\n\n"
-        if prev_user:
-            context += f"Your previous question:\n{prev_user}\n\n"
-
         logger.info(f"Rephrasing: {current_message[:80]}")
+        METRICS.histogram("context.rephrase.context_tokens", PROMPT_TOKEN_BUCKETS).observe(
+            estimate_tokens(context)
+        )
 
-        response = client.responses.create(
-            model="gpt-5",
+        response = await client.responses.create(
+            model=REPHRASE_MODEL,
             input=[
                 {
                     "role": "system",
@@ -70,24 +118,27 @@ def rephrase_with_context(
         if rewritten and rewritten != current_message:
             logger.info(f"✓ Rephrased: '{current_message}' → '{rewritten}'")
 
-        return rewritten if rewritten else current_message
+        result = rewritten if rewritten else current_message
+        _REPHRASE_CACHE.set(key, result)
+        return result
 
     except Exception as e:
         logger.warning(f"Rephrase failed: {str(e)}")
         return current_message
 
 
-def rephrase_with_session_context(
-    client: OpenAI,
+async def rephrase_with_session_context(
+    client: "AsyncOpenAI",
     current_message: str,
     session_state: dict,
     user_id: str | None = None
 ) -> str:
     """Wrapper using session state dict"""
-    return rephrase_with_context(
+    return await rephrase_with_context(
         client=client,
         current_message=current_message,
         previous_user_message=session_state.get("user_message"),
         previous_agent_message=session_state.get("agent_message"),
-        user_id=user_id
+        user_id=user_id,
+        history=session_state.get("history"),
     )
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Redis session backend, shared across hosts.
+
+Needs the optional `redis` package (pip install redis) unless a client is
+passed in; any object with the redis-py `get` / `delete` / `pipeline`
+interface works, e.g. fakeredis in tests or a local stand-in server.
+"""
+
+import json
+import os
+
+from agents.agent_utils.session_store import BufferedSessionStore
+
+SESSION_REDIS_URL = os.environ.get("SESSION_REDIS_URL", "redis://localhost:6379/0")
+SESSION_REDIS_PREFIX = os.environ.get("SESSION_REDIS_PREFIX", "pharmacy:session:")
+
+
+class RedisSessionStore(BufferedSessionStore):
+
+    backend = "redis"
+
+    def __init__(self, client=None, url: str = SESSION_REDIS_URL, prefix: str = SESSION_REDIS_PREFIX, **kwargs):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError(
+                    "SESSION_BACKEND=redis needs the redis package (pip install redis)"
+                ) from None
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        super().__init__(**kwargs)
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def _load(self, session_id: str) -> dict | None:
+        raw = self.client.get(self._key(session_id))
+        return json.loads(raw) if raw else None
+
+    def _write_many(self, items: list[tuple[str, dict]]) -> None:
+        # Expiry is handled by Redis itself (SET ... EX)
+        pipe = self.client.pipeline(transaction=False)
+        for session_id, state in items:
+            pipe.set(self._key(session_id), json.dumps(state, ensure_ascii=False), ex=int(self.ttl_seconds))
+        pipe.execute()
+
+    def _remove(self, session_id: str) -> None:
+        self.client.delete(self._key(session_id))
+
+    def close(self) -> None:
+        super().close()
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,97 @@
+"""
+SQLite session backend: one WAL-mode file shared by all workers on a host.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from agents.agent_utils.session_store import SESSION_MAX_ENTRIES, BufferedSessionStore
+
+SESSION_DB_PATH = os.environ.get("SESSION_DB_PATH", "utils/db/sessions.db")
+
+
+class SqliteSessionStore(BufferedSessionStore):
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = SESSION_DB_PATH, max_entries: int = SESSION_MAX_ENTRIES, **kwargs):
+        self.path = path
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+          session_id TEXT PRIMARY KEY,
+          state TEXT NOT NULL,
+          updated_at REAL NOT NULL,
+          expires_at REAL NOT NULL
+        )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_sessions_updated ON sessions(updated_at)")
+        self._db_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def _load(self, session_id: str) -> dict | None:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT state FROM sessions WHERE session_id = ? AND expires_at > ?",
+                (session_id, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write_many(self, items: list[tuple[str, dict]]) -> None:
+        now = time.time()
+        rows = [
+            (session_id, json.dumps(state, ensure_ascii=False), now, now + self.ttl_seconds)
+            for session_id, state in items
+        ]
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT INTO sessions (session_id, state, updated_at, expires_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(session_id) DO UPDATE SET
+                      state = excluded.state,
+                      updated_at = excluded.updated_at,
+                      expires_at = excluded.expires_at
+                    """,
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _remove(self, session_id: str) -> None:
+        with self._db_lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def _purge(self) -> None:
+        with self._db_lock:
+            self._conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),))
+            # Least recently updated sessions beyond the cap
+            self._conn.execute(
+                """
+                DELETE FROM sessions WHERE session_id IN (
+                  SELECT session_id FROM sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def _backend_stats(self) -> dict:
+        with self._db_lock:
+            live = self._conn.execute(
+                "SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (time.time(),)
+            ).fetchone()[0]
+        return {"live_sessions": live, "max_sessions": self.max_entries, "path": self.path}
+
+    def close(self) -> None:
+        super().close()
+        with self._db_lock:
+            self._conn.close()
@@ -1,17 +1,22 @@
 """
-Session state management that tracks both user and agent messages
+Session state management that tracks both user and agent messages, plus a
+bounded history of recent turns (see conversation_history)
 """
 
-SESSION_STATE = {}
+from agents.agent_utils import conversation_history
+from agents.agent_utils.session_store import get_session_store
+
+EMPTY_STATE = {
+    "user_message": None,
+    "agent_message": None,
+    "history": [],
+}
+
 
 def get_session_state(session_id: str):
     """Get full session state (user and agent messages)"""
-    if session_id not in SESSION_STATE:
-        SESSION_STATE[session_id] = {
-            "user_message": None,
-            "agent_message": None,
-        }
-    return SESSION_STATE[session_id]
+    state = get_session_store().get(session_id)
+    return {**EMPTY_STATE, **(state or {})}
 
 
 def get_prev_user_message(session_id: str) -> str | None:
@@ -27,36 +32,47 @@ def get_prev_agent_message(session_id: str) -> str | None:
 
 
 def get_conversation_context(session_id: str) -> dict:
-    """Get full conversation context (both user and agent)"""
+    """Get full conversation context (last user and agent messages, recent history)"""
     state = get_session_state(session_id)
     return {
         "user_message": state.get("user_message"),
         "agent_message": state.get("agent_message"),
+        "history": state.get("history") or [],
     }
 
 
 def set_user_message(session_id: str, message: str):
-    """Store the user's message"""
-    state = get_session_state(session_id)
-    state["user_message"] = message
+    """Store the user's message and add it to the history"""
+    update_session_state(session_id, user_message=message)
 
 
 def set_agent_message(session_id: str, message: str):
-    """Store the agent's message"""
-    state = get_session_state(session_id)
-    state["agent_message"] = message
+    """Store the agent's message and add it to the history"""
+    update_session_state(session_id, agent_message=message)
 
 
 def update_session_state(session_id: str, user_message: str = None, agent_message: str = None):
     """Update session state with user and/or agent messages"""
-    state = get_session_state(session_id)
-    if user_message is not None:
-        state["user_message"] = user_message
-    if agent_message is not None:
-        state["agent_message"] = agent_message
+    if user_message is None and agent_message is None:
+        return
+
+    def apply(state: dict) -> dict:
+        # Runs under the store's per-session lock, so concurrent turns don't drop entries
+        history = state.get("history") or []
+        for role, message in (("user", user_message), ("agent", agent_message)):
+            if message is not None:
+                state[f"{role}_message"] = message
+                history = conversation_history.append(history, role, message)
+        state["history"] = history
+        return state
+
+    get_session_store().modify(session_id, apply)
 
 
 def clear_session(session_id: str):
     """Clear session state"""
-    if session_id in SESSION_STATE:
-        del SESSION_STATE[session_id]
\ No newline at end of file
+    get_session_store().delete(session_id)
+
+
+def session_stats() -> dict:
+    return get_session_store().stats()
@@ -0,0 +1,327 @@
+"""
+Bounded storage for per-session conversation state.
+
+Sessions expire SESSION_TTL_SECONDS after their last update and the least
+recently used ones are evicted once SESSION_MAX_ENTRIES or SESSION_MAX_MB
+is exceeded, so clients minting new session ids cannot grow memory
+without bound.
+
+SESSION_BACKEND selects where state lives:
+  memory  this process only (default; single worker)
+  sqlite  SQLite file in WAL mode shared by workers on one host
+  redis   Redis (or anything speaking its protocol) shared across hosts
+The shared backends batch writes on a background thread and keep a small
+short-lived read-through cache, so multiple workers / containers see each
+other's turns without sticky sessions.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from utils.cache.lru import TTLCache
+
+SESSION_TTL_SECONDS = float(os.environ.get("SESSION_TTL_SECONDS", "1800"))
+SESSION_MAX_ENTRIES = int(os.environ.get("SESSION_MAX_ENTRIES", "10000"))
+SESSION_MAX_BYTES = int(os.environ.get("SESSION_MAX_MB", "64")) * 1024 * 1024
+SESSION_BACKEND = os.environ.get("SESSION_BACKEND", "memory")
+# Shared backends: how long another worker's write may go unseen
+SESSION_LOCAL_CACHE_SECONDS = float(os.environ.get("SESSION_LOCAL_CACHE_SECONDS", "1"))
+SESSION_FLUSH_MS = float(os.environ.get("SESSION_FLUSH_MS", "50"))
+SESSION_FLUSH_BATCH = int(os.environ.get("SESSION_FLUSH_BATCH", "256"))
+
+# Marks a buffered delete in the pending batch
+_DELETED = object()
+
+# Per-session update locks are striped over this many locks
+_UPDATE_LOCK_STRIPES = 64
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """
+    Interface for session state backends. State is a JSON-able dict; `get`
+    returns a copy, and changes go through `modify` / `update`.
+
+    All methods block (the shared backends do I/O): call them from async
+    code through asyncio.to_thread.
+    """
+
+    def get(self, session_id: str) -> dict | None:
+        raise NotImplementedError
+
+    def modify(self, session_id: str, fn) -> dict:
+        """
+        Atomic read-modify-write: `fn(state)` gets a copy of the current
+        state ({} for a new session) and returns the new one. Concurrent
+        modifications of a session in this process never interleave.
+        """
+        raise NotImplementedError
+
+    def update(self, session_id: str, **fields) -> dict:
+        return self.modify(session_id, lambda state: {**state, **fields})
+
+    def delete(self, session_id: str) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemorySessionStore(SessionStore):
+
+    def __init__(
+        self,
+        ttl_seconds: float = SESSION_TTL_SECONDS,
+        max_entries: int = SESSION_MAX_ENTRIES,
+        max_bytes: int = SESSION_MAX_BYTES,
+    ):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+        # Serializes read-modify-write in `modify`
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def get(self, session_id: str) -> dict | None:
+        state = self._cache.get(session_id)
+        return dict(state) if state is not None else None
+
+    def modify(self, session_id: str, fn) -> dict:
+        with self._lock:
+            current = self._cache.get(session_id)
+            if current is None:
+                self.created += 1
+            state = fn(dict(current or {}))
+            # Re-set so the TTL restarts and the entry's size is re-measured
+            self._cache.set(session_id, state)
+        return dict(state)
+
+    def delete(self, session_id: str) -> None:
+        self._cache.delete(session_id)
+
+    def stats(self) -> dict:
+        cache = self._cache.stats()
+        return {
+            "backend": "memory",
+            "live_sessions": cache["entries"],
+            "max_sessions": cache["max_entries"],
+            "bytes": cache["bytes"],
+            "max_bytes": cache["max_bytes"],
+            "ttl_seconds": self._cache.ttl_seconds,
+            "created": self.created,
+            "evictions": cache["evictions"],
+            "expirations": cache["expirations"],
+        }
+
+
+class BufferedSessionStore(SessionStore):
+    """
+    Base for shared backends. Updates land in a local pending buffer and a
+    read-through cache immediately; a flusher thread writes the buffer out
+    in batches. Subclasses implement the storage calls.
+
+    Deletes are buffered too, as tombstones, and a batch being written stays
+    visible to `get` until its write finishes, so a delete racing a flush
+    can never bring the session back. `modify` is atomic per session within
+    this process (striped locks); across processes the last flush wins.
+    """
+
+    backend = "buffered"
+
+    def __init__(
+        self,
+        ttl_seconds: float = SESSION_TTL_SECONDS,
+        local_cache_seconds: float = SESSION_LOCAL_CACHE_SECONDS,
+        flush_ms: float = SESSION_FLUSH_MS,
+        flush_batch: int = SESSION_FLUSH_BATCH,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_ms / 1000
+        self.flush_batch = flush_batch
+        self._local = TTLCache(max_entries=4096, ttl_seconds=local_cache_seconds)
+
+        # session_id -> state, or _DELETED for a buffered delete
+        self._pending: dict[str, dict] = {}
+        # The batch currently being written
+        self._inflight: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._update_locks = [threading.Lock() for _ in range(_UPDATE_LOCK_STRIPES)]
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        self.created = 0
+        self.reads = 0
+        self.backend_reads = 0
+        self.writes = 0
+        self.flushes = 0
+        self.flush_errors = 0
+
+        self._thread = threading.Thread(target=self._flush_loop, name=f"session-{self.backend}", daemon=True)
+        self._thread.start()
+
+    # ---- Storage (subclasses) ----
+
+    def _load(self, session_id: str) -> dict | None:
+        raise NotImplementedError
+
+    def _write_many(self, items: list[tuple[str, dict]]) -> None:
+        raise NotImplementedError
+
+    def _remove(self, session_id: str) -> None:
+        raise NotImplementedError
+
+    def _purge(self) -> None:
+        """Drop expired / excess sessions (called periodically by the flusher)."""
+
+    def _backend_stats(self) -> dict:
+        return {}
+
+    # ---- SessionStore ----
+
+    def get(self, session_id: str) -> dict | None:
+        self.reads += 1
+        with self._lock:
+            buffered = self._pending.get(session_id)
+            if buffered is None:
+                buffered = self._inflight.get(session_id)
+        if buffered is _DELETED:
+            return None
+        if buffered is not None:
+            return dict(buffered)
+
+        state = self._local.get(session_id)
+        if state is None:
+            self.backend_reads += 1
+            state = self._load(session_id)
+            if state is None:
+                return None
+            self._local.set(session_id, state)
+        return dict(state)
+
+    def modify(self, session_id: str, fn) -> dict:
+        with self._update_locks[hash(session_id) % _UPDATE_LOCK_STRIPES]:
+            current = self.get(session_id)
+            if current is None:
+                self.created += 1
+            state = fn(current or {})
+
+            with self._lock:
+                self._pending[session_id] = state
+                self._local.set(session_id, state)
+                self.writes += 1
+                full = len(self._pending) >= self.flush_batch
+        if full:
+            self._wake.set()
+        return dict(state)
+
+    def delete(self, session_id: str) -> None:
+        with self._update_locks[hash(session_id) % _UPDATE_LOCK_STRIPES]:
+            with self._lock:
+                self._pending[session_id] = _DELETED
+                self._local.delete(session_id)
+                full = len(self._pending) >= self.flush_batch
+        if full:
+            self._wake.set()
+
+    # ---- Flushing ----
+
+    def flush(self) -> None:
+        # One flush at a time, so batches reach the backend in order
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            if not batch:
+                return
+            try:
+                writes = [(sid, state) for sid, state in batch.items() if state is not _DELETED]
+                if writes:
+                    self._write_many(writes)
+                for sid in [sid for sid, state in batch.items() if state is _DELETED]:
+                    self._remove(sid)
+                self.flushes += 1
+            except Exception:
+                self.flush_errors += 1
+                logger.exception("Session flush failed (%d sessions) - will retry", len(batch))
+                with self._lock:
+                    # Newer updates / deletes made meanwhile win over the failed batch
+                    for session_id, state in batch.items():
+                        self._pending.setdefault(session_id, state)
+            finally:
+                with self._lock:
+                    self._inflight = {}
+
+    def _flush_loop(self):
+        last_purge = time.monotonic()
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            if time.monotonic() - last_purge >= 60:
+                last_purge = time.monotonic()
+                try:
+                    self._purge()
+                except Exception:
+                    logger.exception("Session purge failed")
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "ttl_seconds": self.ttl_seconds,
+            "pending_writes": len(self._pending) + len(self._inflight),
+            "created": self.created,
+            "reads": self.reads,
+            "backend_reads": self.backend_reads,
+            "writes": self.writes,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "local_cache": self._local.stats(),
+            **self._backend_stats(),
+        }
+
+
+def create_session_store(backend: str = SESSION_BACKEND) -> SessionStore:
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        from agents.agent_utils.session_sqlite import SqliteSessionStore
+
+        return SqliteSessionStore()
+    if backend == "redis":
+        from agents.agent_utils.session_redis import RedisSessionStore
+
+        return RedisSessionStore()
+    raise ValueError(f"Unknown SESSION_BACKEND {backend!r}; expected memory, sqlite or redis")
+
+
+_STORE: SessionStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = create_session_store()
+    return _STORE
+
+
+def close_session_store() -> None:
+    """Flush pending writes and release the backend."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is not None:
+            _STORE.close()
+            _STORE = None
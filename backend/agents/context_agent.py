@@ -1,22 +1,24 @@
-from agents.agent_utils.session_state import (
-    get_conversation_context,
-    set_user_message,
-    set_agent_message,
-)
+import asyncio
+
+from agents.agent_utils.session_state import get_conversation_context
 from agents.agent_utils.rephrase_question import rephrase_with_session_context
+from agents.agent_utils.rephrase_gate import needs_rephrase
+from utils.metrics.registry import METRICS
 
 
 class ContextAgent:
     """
     Handles contextual message rephrasing using previous session messages.
-    Uses both previous user message and agent response for better context.
+    Uses the recent conversation history (token-budgeted) for context.
+    The LLM is only called when the rephrase gate says the message depends
+    on that context.
     """
 
     def __init__(self, client, logger):
         self.client = client
         self.logger = logger
 
-    def process(self, session_id: str, user_message: str, user_id) -> str:
+    async def process(self, session_id: str, user_message: str, user_id) -> str:
         """
         Rephrase user message using previous user message AND agent response.
 
@@ -29,7 +31,8 @@ class ContextAgent:
             Rephrased user message with resolved references
         """
         # Get full conversation context (both user and agent messages)
-        session_context = get_conversation_context(session_id)
+        # Shared session backends do I/O; keep it off the event loop
+        session_context = await asyncio.to_thread(get_conversation_context, session_id)
 
         prev_user_msg = session_context.get("user_message")
         prev_agent_msg = session_context.get("agent_message")
@@ -40,18 +43,28 @@ class ContextAgent:
         self.logger.info("Current user message: %s", user_message)
         self.logger.info("Previous user message: %s", prev_user_msg)
         self.logger.info("Previous agent message: %s", prev_agent_msg)
+        self.logger.info("History entries: %d", len(session_context["history"]))
 
         try:
-            # Only rephrase if there's previous context
-            if prev_user_msg or prev_agent_msg:
-                self.logger.info("Previous context found - rephrasing with context")
+            needed, reason = needs_rephrase(user_message, session_context)
+        except Exception:
+            self.logger.exception("Rephrase gate failed - rephrasing to be safe")
+            needed, reason = bool(prev_user_msg or prev_agent_msg), "gate_error"
+
+        METRICS.counter(f"context.rephrase.{reason}").inc()
+        METRICS.counter("context.rephrase.called" if needed else "context.rephrase.skipped").inc()
 
-                rephrased_message = rephrase_with_session_context(
-                    self.client,
-                    user_message,
-                    session_context,
-                    user_id
-                )
+        try:
+            if needed:
+                self.logger.info("Rephrasing with context (%s)", reason)
+
+                with METRICS.timer("chat.stage.rephrase_llm_ms"):
+                    rephrased_message = await rephrase_with_session_context(
+                        self.client,
+                        user_message,
+                        session_context,
+                        user_id
+                    )
 
                 if rephrased_message != user_message:
                     self.logger.info("✓ Message rephrased successfully")
@@ -61,15 +74,12 @@ class ContextAgent:
                 else:
                     self.logger.info("Message was already clear - no changes needed")
             else:
-                self.logger.info("No previous context available - using message as-is")
+                self.logger.info("Skipping rephrase (%s) - using message as-is", reason)
 
         except Exception as e:
             self.logger.exception("Rephrasing failed: %s", str(e))
             self.logger.warning("Falling back to original message")
 
-        # Store current user message for next turn
-        self.logger.info("Storing user message for next turn")
-        set_user_message(session_id, user_message)
-
+        # The caller stores the turn (once) so the history gets one user entry per turn
         self.logger.info("=" * 70)
         return user_message
\ No newline at end of file
@@ -12,6 +12,11 @@ from workflows import (
 )
 
 
+def workflow_name(handler) -> str:
+    """Name of the workflow module a routed handler belongs to (e.g. "greetings")."""
+    return handler.__module__.rsplit(".", 1)[-1]
+
+
 class ExecutionAgent:
     """
     Routes self.intents to their corresponding workflow handlers.
@@ -80,8 +85,9 @@ class ExecutionAgent:
             self.logger.exception("Routing failed for intent: %s", self.intent)
             return fallback.handle
 
-    def execute(self, user_message: str, user_id: str):
-        handler = self.route()
+    def execute(self, user_message: str, user_id: str, handler=None):
+        """Run the workflow; pass `handler` when route() was already called."""
+        handler = handler or self.route()
         workflow_result = handler(
                 user_message,
                 user_id=user_id,
@@ -1,5 +1,5 @@
 from bert.labels import Intent
-from bert.classifier import classify_intent
+from inference.service import classify_intent
 
 
 class IntentAgent:
@@ -0,0 +1,92 @@
+import asyncio
+import os
+
+from bert.labels import Intent
+from agents.execution_agent import ExecutionAgent
+from agents.intent_agent import IntentAgent
+from utils.db.async_db import run_db
+from utils.medication.catalog import get_catalog
+from utils.metrics.registry import METRICS
+
+SPECULATIVE_EXECUTION = os.environ.get("SPECULATIVE_EXECUTION", "0") == "1"
+
+# Workflows that write (refill / support tickets) are never run speculatively
+SIDE_EFFECT_INTENTS = frozenset({"REFILL_REQUEST", "SUPPORT"})
+
+
+def _entity_id(message: str):
+    med = get_catalog().resolve(message)
+    return med["id"] if med else None
+
+
+class SpeculativeAgent:
+    """
+    Classifies the raw message and runs its read-only workflow while the
+    ContextAgent is still rephrasing.
+
+    Every read-only workflow's context depends only on the intent and the
+    medication the message resolves to, so when the final message keeps
+    both, the speculative context is reused; otherwise it is discarded.
+    A rephrased message is still classified again after the rephrase, so
+    only the workflow pass is taken off the critical path.
+    """
+
+    def __init__(self, logger, user_id):
+        self.logger = logger
+        self.user_id = user_id
+        self.message = None
+        self._task: asyncio.Task | None = None
+
+    def start(self, user_message: str) -> "SpeculativeAgent":
+        self.message = user_message
+        self._task = asyncio.create_task(self._run(user_message))
+        return self
+
+    def _classify(self, message: str):
+        """Intent and medication of `message`; blocking, run off the event loop."""
+        return IntentAgent(self.logger).process(message, self.user_id), _entity_id(message)
+
+    async def _run(self, message: str):
+        intent, entity = await asyncio.to_thread(self._classify, message)
+
+        if intent == Intent.UNKNOWN or getattr(intent, "name", None) in SIDE_EFFECT_INTENTS:
+            return intent, entity, None
+
+        _, system_context = await run_db(
+            ExecutionAgent(self.logger, intent).execute,
+            message,
+            self.user_id,
+        )
+        return intent, entity, system_context
+
+    async def resolve(self, processed_message: str):
+        """
+        Returns (intent, system_context) for the final message. system_context
+        is None when the workflow still has to run.
+        """
+        try:
+            spec_intent, spec_entity, spec_context = await self._task
+        except Exception:
+            self.logger.exception("Speculative execution failed")
+            METRICS.counter("speculation.failed").inc()
+            intent = await asyncio.to_thread(
+                IntentAgent(self.logger).process, processed_message, self.user_id
+            )
+            return intent, None
+
+        if processed_message == self.message:
+            METRICS.counter("speculation.reused.same_message").inc()
+            self.logger.info("Speculation reused (message unchanged)")
+            return spec_intent, spec_context
+
+        intent, entity = await asyncio.to_thread(self._classify, processed_message)
+        if intent == spec_intent and entity == spec_entity:
+            METRICS.counter("speculation.reused.same_intent_entity").inc()
+            self.logger.info("Speculation reused (same intent and medication)")
+            return intent, spec_context
+
+        METRICS.counter("speculation.discarded").inc()
+        self.logger.info(
+            "Speculation discarded: %s -> %s", spec_intent, intent
+        )
+        return intent, None
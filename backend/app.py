@@ -1,29 +1,58 @@
+import asyncio
 import os
+import threading
 import time
 from fastapi import FastAPI, Request, HTTPException, status, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from openai import OpenAI
 from dotenv import load_dotenv
 from enum import Enum
 
 from agents.agent_utils.session_state import (
-    get_conversation_context,
+    session_stats,
     set_user_message,
     set_agent_message,
 )
-from agents.agent_utils.rephrase_question import rephrase_with_session_context
-
+from agents.agent_utils.direct_responses import get_direct_response, template_language
+from agents.agent_utils.language import detect_language
+from agents.agent_utils.session_store import close_session_store
+from agents.agent_utils.llm_client import close_llm_client, get_llm_client
+from agents.agent_utils.rephrase_question import rephrase_cache_stats
 from agents.context_agent import ContextAgent
-from agents.execution_agent import ExecutionAgent
+from agents.execution_agent import ExecutionAgent, workflow_name
 from agents.intent_agent import IntentAgent
+from agents.speculative_agent import SPECULATIVE_EXECUTION, SpeculativeAgent
 
-from utils.prescription.get_prescriptions_per_user import get_prescription_per_user
-from utils.support.get_support_per_user import get_support_per_user
-from utils.prescription.get_all_prescription_requests import get_all_prescription_requests
+from utils.prescription.get_prescriptions_per_user import (
+    count_prescriptions_per_user,
+    get_prescription_per_user,
+)
+from utils.support.get_support_per_user import count_support_per_user, get_support_per_user
+from utils.prescription.get_all_prescription_requests import (
+    count_all_prescription_requests,
+    get_all_prescription_requests,
+)
 from utils.support.get_all_support_requests import get_all_support_requests
 from utils.medication.get_medications_sold import get_medications_sold
-from utils.db.db import conn
+from utils.medication.get_medication_names import get_medication_names
+from utils.medication.catalog import get_catalog
+from utils.db.db import connection, get_pool, init_schema, pool_stats
+from utils.db.async_db import run_db, shutdown_db_executor
+from utils.db.pagination import decode_cursor, next_cursor
+from utils.metrics.registry import METRICS
+from utils.metrics.startup import StartupTracker
+from inference.service import (
+    intent_service_stats,
+    shutdown_intent_service,
+    warmup_intent_model,
+)
+from utils.cache.response_cache import (
+    RESPONSE_CACHE_ENABLED,
+    get_response_cache,
+    is_cacheable,
+    iter_chunks,
+    make_key,
+)
 from utils.prescription.update_prescription_request_status import update_prescription_request_status
 from utils.support.update_support_request_status import update_support_request_status
 from utils.users.get_user_by_id import get_user_by_id
@@ -31,7 +60,12 @@ from utils.users.fetch_users import fetch_users
 
 from bert.labels import Intent
 from agents.agent_utils.policy_prompt import SYSTEM_PROMPT
-from utils.logging_utils.session_logger import get_session_logger
+from utils.logging_utils.async_writer import log_writer_stats, stop_log_writer
+from utils.logging_utils.context import REQUEST_ID, REQUEST_ID_HEADER, new_request_id
+from utils.logging_utils.json_sink import close_log_sink
+from utils.logging_utils.registry import open_fd_count
+from utils.logging_utils.session_logger import get_session_logger, session_logger_stats
+from utils.logging_utils.workflow_logger import workflow_logger_stats
 
 load_dotenv()
 
@@ -51,8 +85,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+
+
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """Tag every log record of the request with one id, echoed in the response"""
+    request_id = new_request_id(request.headers.get(REQUEST_ID_HEADER))
+    token = REQUEST_ID.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        REQUEST_ID.reset(token)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+
+LLM_MODEL = "gpt-5"
 LLM_TIMEOUT_SECONDS = 60
+MAX_SESSION_ID_LENGTH = 128
 
 # ============================================================================
 # Constants & Enums
@@ -71,15 +121,15 @@ class StatusEnum(str, Enum):
 # Helper Functions
 # ============================================================================
 
-def validate_user(user_id: str):
-    """Validate user exists and return user object"""
+def _require_user_id(user_id: str):
     if not user_id or not user_id.strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="user_id is required",
         )
 
-    user = get_user_by_id(user_id)
+
+def _require_user(user):
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -88,6 +138,18 @@ def validate_user(user_id: str):
     return user
 
 
+def validate_user(user_id: str):
+    """Validate user exists and return user object"""
+    _require_user_id(user_id)
+    return _require_user(get_user_by_id(user_id))
+
+
+async def validate_user_async(user_id: str):
+    """Validate user exists without blocking the event loop"""
+    _require_user_id(user_id)
+    return _require_user(await run_db(get_user_by_id, user_id))
+
+
 def validate_status(status_value: str):
     """Validate status is allowed"""
     if status_value not in VALID_STATUSES:
@@ -98,7 +160,20 @@ def validate_status(status_value: str):
     return status_value
 
 
-def enrich_prescription(p, user_id=None):
+def validate_cursor(cursor: str | None):
+    """Decode an opaque pagination cursor"""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def enrich_prescription(p, user_id=None, medication_names=None):
     """Add missing fields to prescription object"""
     try:
         # Convert to dict if not already
@@ -107,10 +182,13 @@ def enrich_prescription(p, user_id=None):
         else:
             enriched = vars(p).copy() if hasattr(p, '__dict__') else p
 
-        # If we have medication_id but no medication_name, fetch it from DB
+        # If we have medication_id but no medication_name, resolve it
+        # (from the batch lookup when called through enrich_prescriptions)
         if "medication_name" not in enriched and "medication_id" in enriched:
-            med_name = get_medication_name(enriched.get("medication_id"))
-            enriched["medication_name"] = med_name
+            medication_id = enriched.get("medication_id")
+            if medication_names is None:
+                medication_names = lookup_medication_names([medication_id])
+            enriched["medication_name"] = medication_names.get(medication_id, medication_id)
 
         # Add user_id if provided
         if user_id and "user_id" not in enriched:
@@ -122,24 +200,12 @@ def enrich_prescription(p, user_id=None):
         return p
 
 
-def get_medication_name(medication_id):
-    """Get medication name from database"""
+def lookup_medication_names(medication_ids):
+    """Get medication names for many ids in one query"""
     try:
-        c = conn()
-        cur = c.cursor()
-        cur.execute(
-            "SELECT brand_name, generic_name FROM medications WHERE id = ?",
-            (medication_id,)
-        )
-        row = cur.fetchone()
-        c.close()
-
-        if row:
-            row_dict = dict(row)
-            return row_dict.get("brand_name") or row_dict.get("generic_name") or medication_id
-        return medication_id
+        return get_medication_names(medication_ids)
     except Exception:
-        return medication_id
+        return {}
 
 
 def enrich_support(s, user_id=None):
@@ -161,9 +227,36 @@ def enrich_support(s, user_id=None):
         return s
 
 
+def load_dashboard_data():
+    """Load and enrich everything the pharmacist dashboard shows"""
+    with connection():
+        prescriptions = get_all_prescription_requests() or []
+        support_requests = get_all_support_requests() or []
+        medications_sold = get_medications_sold() or []
+
+        prescriptions = enrich_prescriptions(prescriptions)
+        support_requests = enrich_supports(support_requests)
+
+    return {
+        "prescriptions": prescriptions,
+        "support_requests": support_requests,
+        "medications_sold": medications_sold,
+    }
+
+
 def enrich_prescriptions(prescriptions, user_id=None):
-    """Enrich list of prescriptions"""
-    return [enrich_prescription(p, user_id) for p in prescriptions] if prescriptions else []
+    """Enrich list of prescriptions with a single medication-name lookup"""
+    if not prescriptions:
+        return []
+
+    missing_ids = [
+        p.get("medication_id")
+        for p in prescriptions
+        if isinstance(p, dict) and "medication_name" not in p
+    ]
+    medication_names = lookup_medication_names(missing_ids) if missing_ids else {}
+
+    return [enrich_prescription(p, user_id, medication_names) for p in prescriptions]
 
 
 def enrich_supports(supports, user_id=None):
@@ -171,6 +264,16 @@ def enrich_supports(supports, user_id=None):
     return [enrich_support(s, user_id) for s in supports] if supports else []
 
 
+def lookup_cached_response(intent, system_context, user_prompt, lang):
+    """(cache key, cached answer or None) for a cacheable workflow context and question"""
+    catalog_version = get_catalog().version
+    response_cache = get_response_cache()
+    response_cache.observe_catalog_version(catalog_version)
+
+    key = make_key(intent, system_context, user_prompt, lang, SYSTEM_PROMPT, LLM_MODEL, catalog_version)
+    return key, response_cache.get(key)
+
+
 # ============================================================================
 # User Endpoints
 # ============================================================================
@@ -224,26 +327,24 @@ def list_prescriptions(
         status_filter: str = Query(None, description="Filter by status"),
         limit: int = Query(50, ge=1, le=100),
         offset: int = Query(0, ge=0),
+        cursor: str = Query(None, description="Opaque cursor from a previous page"),
 ):
     """Get user's prescriptions with filtering and pagination"""
     user = validate_user(user_id)
 
     if status_filter:
         validate_status(status_filter)
+    after = validate_cursor(cursor)
 
     try:
-        prescriptions = get_prescription_per_user(user_id)
-        prescriptions = prescriptions if prescriptions else []
-
-        # Enrich with user_id and medication_id
-        prescriptions = enrich_prescriptions(prescriptions, user_id)
-
-        # Filter by status
-        if status_filter:
-            prescriptions = [p for p in prescriptions if p.get("status") == status_filter]
+        with connection():
+            prescriptions = get_prescription_per_user(
+                user_id, status=status_filter, limit=limit, offset=offset, after=after
+            )
+            total = count_prescriptions_per_user(user_id, status=status_filter)
 
-        total = len(prescriptions)
-        prescriptions = prescriptions[offset:offset + limit]
+            # Enrich with user_id and medication_id
+            prescriptions = enrich_prescriptions(prescriptions, user_id)
 
         return {
             "success": True,
@@ -252,6 +353,7 @@ def list_prescriptions(
                 "limit": limit,
                 "offset": offset,
                 "total": total,
+                "next_cursor": next_cursor(prescriptions, limit),
             }
         }
     except Exception:
@@ -300,7 +402,7 @@ async def update_prescription_status(
         req: Request
 ):
     """Update prescription status"""
-    user = validate_user(user_id)
+    user = await validate_user_async(user_id)
 
     try:
         body = await req.json()
@@ -320,7 +422,7 @@ async def update_prescription_status(
     validate_status(status_value)
 
     try:
-        update_prescription_request_status(prescription_id, status_value)
+        await run_db(update_prescription_request_status, prescription_id, status_value)
         return {
             "success": True,
             "data": {
@@ -329,6 +431,8 @@ async def update_prescription_status(
                 "message": f"Prescription status updated to {status_value}",
             }
         }
+    except HTTPException:
+        raise
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -346,26 +450,25 @@ def list_support_requests(
         status_filter: str = Query(None, description="Filter by status"),
         limit: int = Query(50, ge=1, le=100),
         offset: int = Query(0, ge=0),
+        cursor: str = Query(None, description="Opaque cursor from a previous page"),
 ):
     """Get user's support tickets with filtering and pagination"""
     user = validate_user(user_id)
 
     if status_filter:
         validate_status(status_filter)
+    after = validate_cursor(cursor)
 
     try:
-        tickets = get_support_per_user(user_id)
-        tickets = tickets if tickets else []
+        with connection():
+            tickets = get_support_per_user(
+                user_id, status=status_filter, limit=limit, offset=offset, after=after
+            )
+            total = count_support_per_user(user_id, status=status_filter)
 
         # Enrich with user_id
         tickets = enrich_supports(tickets, user_id)
 
-        if status_filter:
-            tickets = [t for t in tickets if t.get("status") == status_filter]
-
-        total = len(tickets)
-        tickets = tickets[offset:offset + limit]
-
         return {
             "success": True,
             "data": tickets,
@@ -373,6 +476,7 @@ def list_support_requests(
                 "limit": limit,
                 "offset": offset,
                 "total": total,
+                "next_cursor": next_cursor(tickets, limit),
             }
         }
     except Exception:
@@ -421,7 +525,7 @@ async def update_support_status(
         req: Request
 ):
     """Update support ticket status"""
-    user = validate_user(user_id)
+    user = await validate_user_async(user_id)
 
     try:
         body = await req.json()
@@ -441,7 +545,7 @@ async def update_support_status(
     validate_status(status_value)
 
     try:
-        update_support_request_status(ticket_id, status_value)
+        await run_db(update_support_request_status, ticket_id, status_value)
         return {
             "success": True,
             "data": {
@@ -450,6 +554,8 @@ async def update_support_status(
                 "message": f"Support ticket status updated to {status_value}",
             }
         }
+    except HTTPException:
+        raise
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -473,21 +579,9 @@ def pharmacist_dashboard(user_id: str = Query(..., description="Pharmacist user
         )
 
     try:
-        prescriptions = get_all_prescription_requests() or []
-        support_requests = get_all_support_requests() or []
-        medications_sold = get_medications_sold() or []
-
-        # Enrich all data
-        prescriptions = enrich_prescriptions(prescriptions)
-        support_requests = enrich_supports(support_requests)
-
         return {
             "success": True,
-            "data": {
-                "prescriptions": prescriptions,
-                "support_requests": support_requests,
-                "medications_sold": medications_sold,
-            }
+            "data": load_dashboard_data(),
         }
     except Exception:
         raise HTTPException(
@@ -502,6 +596,7 @@ def pharmacist_prescriptions(
         status_filter: str = Query(None, description="Filter by status"),
         limit: int = Query(50, ge=1, le=100),
         offset: int = Query(0, ge=0),
+        cursor: str = Query(None, description="Opaque cursor from a previous page"),
 ):
     """Get all prescriptions (pharmacist only)"""
     user = validate_user(user_id)
@@ -514,16 +609,15 @@ def pharmacist_prescriptions(
 
     if status_filter:
         validate_status(status_filter)
+    after = validate_cursor(cursor)
 
     try:
-        prescriptions = get_all_prescription_requests() or []
-        prescriptions = enrich_prescriptions(prescriptions)
-
-        if status_filter:
-            prescriptions = [p for p in prescriptions if p.get("status") == status_filter]
-
-        total = len(prescriptions)
-        prescriptions = prescriptions[offset:offset + limit]
+        with connection():
+            prescriptions = get_all_prescription_requests(
+                status=status_filter, limit=limit, offset=offset, after=after
+            )
+            total = count_all_prescription_requests(status=status_filter)
+            prescriptions = enrich_prescriptions(prescriptions)
 
         return {
             "success": True,
@@ -532,6 +626,7 @@ def pharmacist_prescriptions(
                 "limit": limit,
                 "offset": offset,
                 "total": total,
+                "next_cursor": next_cursor(prescriptions, limit),
             }
         }
     except Exception:
@@ -545,17 +640,6 @@ def pharmacist_prescriptions(
 # Chat Endpoint
 # ============================================================================
 
-"""
-Example: How to integrate session state and rephrase into chat endpoint
-"""
-
-from agents.agent_utils.session_state import (
-    get_conversation_context,
-    set_user_message,
-    set_agent_message,
-)
-from agents.agent_utils.rephrase_question import rephrase_with_session_context
-
 @app.post("/chat", tags=["Chat"])
 async def chat(req: Request):
     """Send message to AI pharmacist agent"""
@@ -568,10 +652,18 @@ async def chat(req: Request):
         )
 
     user_message = body.get("message", "").strip()
-    session_id = body.get("session_id", "anonymous")
+    session_id = body.get("session_id")
     user_id = body.get("user_id")
 
-    user = validate_user(user_id)
+    user = await validate_user_async(user_id)
+
+    # Without a session id, fall back to one per user - never a shared default
+    session_id = str(session_id).strip() if session_id else f"user-{user_id}"
+    if len(session_id) > MAX_SESSION_ID_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="session_id is too long",
+        )
     logger = get_session_logger(session_id, user_id)
     logger.info("New chat request from %s", user.get("full_name", "Unknown"))
 
@@ -579,21 +671,10 @@ async def chat(req: Request):
     if user.get("role") == "pharmacist":
         logger.info("Pharmacist accessed dashboard")
         try:
-            prescriptions = get_all_prescription_requests() or []
-            support_requests = get_all_support_requests() or []
-            medications_sold = get_medications_sold() or []
-
-            prescriptions = enrich_prescriptions(prescriptions)
-            support_requests = enrich_supports(support_requests)
-
             return {
                 "success": True,
                 "type": "dashboard",
-                "data": {
-                    "prescriptions": prescriptions,
-                    "support_requests": support_requests,
-                    "medications_sold": medications_sold,
-                }
+                "data": await run_db(load_dashboard_data),
             }
         except Exception:
             raise HTTPException(
@@ -607,47 +688,71 @@ async def chat(req: Request):
             detail="Message cannot be empty",
         )
 
-    # ========== Get session context and rephrase if needed ==========
-    session_context = get_conversation_context(session_id)
-    rephrased_message = rephrase_with_session_context(
-        client=client,
-        current_message=user_message,
-        session_state=session_context,
-        user_id=user_id
+    # Classify and look up the raw message while the context stage runs
+    speculation = (
+        SpeculativeAgent(logger, user_id).start(user_message)
+        if SPECULATIVE_EXECUTION else None
     )
 
-    logger.info("Original: %s", user_message[:100])
-    if rephrased_message != user_message:
-        logger.info("Rephrased: %s", rephrased_message[:100])
-    # ================================================================
-
-    # Agent Pipeline - use rephrased message
+    # Agent Pipeline - ContextAgent is the single place messages get rephrased
     try:
-        processed_message = ContextAgent(client, logger).process(
-            session_id, rephrased_message, user_id
-        )
+        with METRICS.timer("chat.stage.context_ms"):
+            processed_message = await ContextAgent(get_llm_client(), logger).process(
+                session_id, user_message, user_id
+            )
     except Exception:
         logger.exception("ContextAgent failed (non-fatal)")
-        processed_message = rephrased_message
+        processed_message = user_message
 
+    system_context = None
     try:
-        intent = IntentAgent(logger).process(processed_message, user_id)
+        with METRICS.timer("chat.stage.intent_ms"):
+            if speculation is not None:
+                intent, system_context = await speculation.resolve(processed_message)
+            else:
+                # BERT inference is CPU-bound; keep it off the event loop
+                intent = await asyncio.to_thread(
+                    IntentAgent(logger).process, processed_message, user_id
+                )
     except Exception:
         logger.exception("IntentAgent failed")
         intent = Intent.UNKNOWN
 
-    if intent == Intent.UNKNOWN:
+    # Routed once; the handler is reused if the workflow has to run
+    execution_agent = handler = None
+    workflow = "unknown"
+    if intent != Intent.UNKNOWN:
+        execution_agent = ExecutionAgent(logger, intent)
+        handler = execution_agent.route()
+        workflow = workflow_name(handler)
+
+    # Static workflows are answered from prewritten templates - no LLM call
+    direct_response = get_direct_response(
+        workflow, template_language(user.get("preferred_lang"), user_message)
+    )
+
+    if direct_response is not None:
+        logger.info("Direct response for workflow %s", workflow)
+        METRICS.counter(f"chat.direct_response.{workflow}").inc()
+    elif intent == Intent.UNKNOWN:
         logger.info("UNKNOWN intent")
         system_context = ""
         user_prompt = (
             "Tell the user politely that you can only help with pharmacy-related "
             "questions such as medications, prescriptions, or availability."
         )
+    elif system_context is not None:
+        # Speculative workflow result still matches the final message
+        user_prompt = processed_message
     else:
         try:
-            user_prompt, system_context = ExecutionAgent(
-                logger, intent
-            ).execute(processed_message, user_id)
+            with METRICS.timer("chat.stage.execution_ms"):
+                user_prompt, system_context = await run_db(
+                    execution_agent.execute,
+                    processed_message,
+                    user_id,
+                    handler,
+                )
             logger.info("Workflow executed successfully")
         except Exception:
             logger.exception("ExecutionAgent failed")
@@ -657,16 +762,42 @@ async def chat(req: Request):
             )
 
     # FIX: Store user message BEFORE streaming starts
-    set_user_message(session_id, user_message)
+    await asyncio.to_thread(set_user_message, session_id, user_message)
+
+    # Deterministic workflow contexts are answered from the response cache
+    cache_key = None
+    cached_response = None
+    if direct_response is None and RESPONSE_CACHE_ENABLED and is_cacheable(intent, system_context):
+        lang = detect_language(user_message, user.get("preferred_lang") or "en")
+        cache_key, cached_response = await asyncio.to_thread(
+            lookup_cached_response, intent, system_context, user_prompt, lang
+        )
+        METRICS.counter(
+            "chat.response_cache.hit" if cached_response is not None else "chat.response_cache.miss"
+        ).inc()
+        if cached_response is not None:
+            logger.info("Serving cached response")
+
+    # Template or cached answer: streamed without calling the LLM
+    prepared_response = direct_response if direct_response is not None else cached_response
 
     # Buffer to collect the full response
     agent_response_buffer = []
 
     async def event_stream():
         """Stream agent response and collect for storage"""
+        if prepared_response is not None:
+            for chunk in iter_chunks(prepared_response):
+                agent_response_buffer.append(chunk)
+                yield chunk
+                await asyncio.sleep(0)
+            await asyncio.to_thread(set_agent_message, session_id, prepared_response.strip())
+            return
+
+        started = time.perf_counter()
         try:
-            response = client.responses.create(
-                model="gpt-5",
+            response = await get_llm_client().responses.create(
+                model=LLM_MODEL,
                 input=[
                     {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "system", "content": system_context},
@@ -675,8 +806,12 @@ async def chat(req: Request):
                 stream=True,
             )
 
-            for event in response:
+            async for event in response:
                 if event.type == "response.output_text.delta" and event.delta:
+                    if not agent_response_buffer:
+                        METRICS.histogram("chat.stage.first_token_ms").observe(
+                            (time.perf_counter() - started) * 1000
+                        )
                     agent_response_buffer.append(event.delta)
                     yield event.delta
 
@@ -688,11 +823,69 @@ async def chat(req: Request):
         # FIX: Store agent message AFTER streaming completes
         full_agent_response = "".join(agent_response_buffer).strip()
         if full_agent_response:
-            set_agent_message(session_id, full_agent_response)
+            await asyncio.to_thread(set_agent_message, session_id, full_agent_response)
             logger.info("Agent response stored in session: %s", full_agent_response[:100])
+            if cache_key is not None:
+                await asyncio.to_thread(get_response_cache().set, cache_key, full_agent_response)
 
     return StreamingResponse(event_stream(), media_type="text/plain")
 
+# ============================================================================
+# Lifecycle
+# ============================================================================
+
+STARTUP = StartupTracker(("schema", "catalog", "intent_model", "response_cache", "llm_client"))
+
+
+def load_catalog():
+    catalog = get_catalog()
+    catalog.load()
+    catalog.start_refresher()
+
+
+def open_response_cache():
+    get_response_cache().observe_catalog_version(get_catalog().version)
+
+
+def warm_up():
+    """Slow startup phases; each is timed, and a failure leaves /ready at 503"""
+    for name, fn in (
+        ("catalog", load_catalog),
+        ("intent_model", warmup_intent_model),
+        ("response_cache", open_response_cache),
+        ("llm_client", get_llm_client),
+    ):
+        try:
+            with STARTUP.phase(name):
+                fn()
+        except Exception:
+            pass
+
+
+@app.on_event("startup")
+def startup():
+    # Creates missing tables and applies pending migrations
+    with STARTUP.phase("schema"):
+        init_schema()
+
+    # Model loading / warmup runs in the background so /health answers
+    # right away; /ready reports 200 once every phase has finished
+    threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    get_catalog().stop_refresher()
+    shutdown_intent_service()
+    shutdown_db_executor()
+    get_pool().close_all()
+    get_response_cache().close()
+    close_session_store()
+    stop_log_writer()
+    close_log_sink()
+    await close_llm_client()
+
+
 # ============================================================================
 # Health Check
 # ============================================================================
@@ -704,4 +897,38 @@ def health():
         "success": True,
         "service": "Pharmacy Agent Backend",
         "status": "healthy"
+    }
+
+
+@app.get("/ready", tags=["Health"])
+def ready():
+    """Readiness probe: 503 until the catalog and intent model are loaded and warm"""
+    report = STARTUP.report()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"success": report["ready"], **report},
+    )
+
+
+@app.get("/metrics", tags=["Health"])
+def metrics():
+    """Runtime metrics for the backend"""
+    return {
+        "success": True,
+        "data": {
+            "startup": STARTUP.report(),
+            "db_pool": pool_stats(),
+            "medication_catalog": get_catalog().stats(),
+            "response_cache": get_response_cache().stats(),
+            "sessions": session_stats(),
+            "rephrase_cache": rephrase_cache_stats(),
+            "loggers": {
+                "session": session_logger_stats(),
+                "workflow": workflow_logger_stats(),
+                "open_fds": open_fd_count(),
+                "writer": log_writer_stats(),
+            },
+            "intent_service": intent_service_stats(),
+            "pipeline": METRICS.snapshot(),
+        }
     }
\ No newline at end of file
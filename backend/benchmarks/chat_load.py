@@ -0,0 +1,141 @@
+"""
+Load test: concurrent streaming /chat requests against a running backend.
+
+Opens N streams at once and records time-to-first-byte and total time per
+stream. If the server serialized streams (a blocking LLM iterator on the
+event loop), wall time would approach the sum of the stream durations and
+"overlap" would sit near 1; with non-blocking streaming it approaches the
+concurrency level.
+
+Start the server with the response cache off. A repeated cacheable question
+is otherwise answered once by the LLM and replayed from the cache for every
+later stream, which measures the replay loop rather than the AsyncOpenAI
+streaming path. Streams also rotate through MESSAGES so neighbouring
+requests do not ask the same question.
+
+    cd backend && RESPONSE_CACHE_ENABLED=0 uvicorn app:app --port 8000 &
+    python -m benchmarks.chat_load --user-id <customer id> --concurrency 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+# Questions the streams rotate through: seeded medications across several
+# intents, all answered by the LLM from a workflow context
+MESSAGES = [
+    "What are the side effects of Nurofen?",
+    "How much Acamol can I take in a day?",
+    "What is the active ingredient in Augmentin?",
+    "Do I need a prescription for Glucophage?",
+    "Can I take Nurofen together with Acamol?",
+    "Does Claritin make you drowsy?",
+    "How do I use Ventolin?",
+    "What is the usual dose of Glucophage?",
+    "Is Augmentin safe if I am allergic to penicillin?",
+    "What does Claritin contain?",
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def one_stream(client: httpx.AsyncClient, url: str, user_id: str, message: str) -> dict:
+    payload = {"message": message, "user_id": user_id, "session_id": f"load-{uuid.uuid4().hex}"}
+    started = time.perf_counter()
+    ttfb = None
+    chunks = 0
+    max_gap = 0.0
+    last = started
+
+    async with client.stream("POST", f"{url}/chat", json=payload) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            now = time.perf_counter()
+            if ttfb is None:
+                ttfb = now - started
+            else:
+                max_gap = max(max_gap, now - last)
+            last = now
+            chunks += len(chunk) > 0
+
+    total = time.perf_counter() - started
+    return {"ttfb": ttfb if ttfb is not None else total, "total": total, "chunks": chunks, "max_gap": max_gap}
+
+
+async def response_cache_enabled(client: httpx.AsyncClient, url: str) -> bool | None:
+    try:
+        response = await client.get(f"{url}/metrics")
+        response.raise_for_status()
+        return response.json()["data"]["response_cache"]["enabled"]
+    except (httpx.HTTPError, KeyError, ValueError):
+        return None
+
+
+async def run(args) -> None:
+    messages = args.message or MESSAGES
+    limits = httpx.Limits(max_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        if await response_cache_enabled(client, args.url):
+            print(
+                "warning: the server has the response cache enabled; repeated questions are "
+                "replayed from the cache instead of streamed from the LLM. "
+                "Restart it with RESPONSE_CACHE_ENABLED=0."
+            )
+
+        # Warm up the connection, catalog and model before measuring
+        await one_stream(client, args.url, args.user_id, messages[0])
+
+        for round_no in range(1, args.rounds + 1):
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *[
+                    one_stream(client, args.url, args.user_id, messages[i % len(messages)])
+                    for i in range(args.concurrency)
+                ],
+                return_exceptions=True,
+            )
+            wall = time.perf_counter() - started
+
+            ok = [r for r in results if isinstance(r, dict)]
+            failed = len(results) - len(ok)
+            if not ok:
+                print(f"round {round_no}: all {failed} requests failed ({results[0]!r})")
+                continue
+
+            ttfb = [r["ttfb"] * 1000 for r in ok]
+            totals = [r["total"] * 1000 for r in ok]
+            gaps = [r["max_gap"] * 1000 for r in ok]
+            overlap = sum(r["total"] for r in ok) / wall
+
+            print(f"round {round_no}: {len(ok)} streams ({failed} failed) in {wall * 1000:.0f}ms wall")
+            print(f"  ttfb    p50 {statistics.median(ttfb):8.1f}ms  p95 {percentile(ttfb, 95):8.1f}ms  max {max(ttfb):8.1f}ms")
+            print(f"  total   p50 {statistics.median(totals):8.1f}ms  p95 {percentile(totals, 95):8.1f}ms  max {max(totals):8.1f}ms")
+            print(f"  max inter-chunk gap p95 {percentile(gaps, 95):8.1f}ms")
+            print(f"  overlap {overlap:.1f}x (1.0 = fully serialized, {args.concurrency} = fully concurrent)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--user-id", required=True, help="Existing customer user id")
+    parser.add_argument(
+        "--message",
+        action="append",
+        help="Question to send; repeat to rotate through several (default: MESSAGES)",
+    )
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Parity + latency benchmark for the intent classifier backends.
+
+Every backend is run over a labeled set and compared with the reference:
+the original full-precision model behind bert.classifier, called one
+message at a time. Reported per backend: intent agreement with the
+reference, accuracy against the labels, single-message latency and
+batched throughput. Exits non-zero if any backend agrees with the
+reference on fewer than --min-agreement of the messages, so it can gate
+a model export.
+
+    cd backend && python -m inference.export_onnx
+    python -m benchmarks.intent_backends --backends torch,torch_int8,onnx,onnx_int8
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from inference.service import BACKENDS, load_backend
+
+DEFAULT_LABELED = os.path.join(os.path.dirname(__file__), "data", "intent_samples.jsonl")
+MIN_AGREEMENT = 0.98
+
+
+def load_labeled(path: str) -> list[tuple[str, str]]:
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [(row["text"], row["intent"]) for row in rows]
+
+
+def reference_predictions(texts: list[str]) -> list:
+    """Intents from the original bert.classifier, whatever backends are benchmarked."""
+    from bert.classifier import classify_intent
+
+    return [classify_intent(text) for text in texts]
+
+
+def agreement(predictions: list, reference: list) -> float:
+    return sum(p == r for p, r in zip(predictions, reference)) / len(reference)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def predict_all(backend, texts: list[str], batch_size: int) -> list:
+    out = []
+    for i in range(0, len(texts), batch_size):
+        out.extend(backend.predict_batch(texts[i:i + batch_size]))
+    return out
+
+
+def measure(backend, texts: list[str], batch_size: int, repeat: int) -> dict:
+    # Warm-up: first calls pay allocator / graph setup costs
+    predict_all(backend, texts[:batch_size], batch_size)
+
+    single = []
+    for _ in range(repeat):
+        for text in texts:
+            started = time.perf_counter()
+            backend.predict_batch([text])
+            single.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        predict_all(backend, texts, batch_size)
+    batched_seconds = time.perf_counter() - started
+
+    return {
+        "p50_ms": statistics.median(single),
+        "p95_ms": percentile(single, 95),
+        "throughput": len(texts) * repeat / batched_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", default="torch,torch_int8,onnx_int8")
+    parser.add_argument("--labeled", default=DEFAULT_LABELED, help="JSONL with text / intent per line")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-agreement", type=float, default=MIN_AGREEMENT)
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.backends.split(",") if n.strip()]
+    unknown = [n for n in names if n not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown backend(s): {', '.join(unknown)}")
+
+    labeled = load_labeled(args.labeled)
+    texts = [text for text, _ in labeled]
+    labels = [label for _, label in labeled]
+    print(f"{len(texts)} labeled messages from {args.labeled}\n")
+
+    reference = reference_predictions(texts)
+    reference_accuracy = sum(r.name == label for r, label in zip(reference, labels)) / len(texts)
+    print(f"reference (bert.classifier) accuracy {reference_accuracy:.1%}\n")
+
+    failed = []
+    print(f"{'backend':<11} {'agree':>7} {'accuracy':>9} {'p50 ms':>8} {'p95 ms':>8} {'msg/s':>9}")
+    for name in names:
+        backend = load_backend(name)
+        predictions = predict_all(backend, texts, args.batch_size)
+
+        agreed = agreement(predictions, reference)
+        accuracy = sum(p.name == label for p, label in zip(predictions, labels)) / len(texts)
+        timing = measure(backend, texts, args.batch_size, args.repeat)
+
+        print(
+            f"{name:<11} {agreed:>7.1%} {accuracy:>9.1%} "
+            f"{timing['p50_ms']:>8.2f} {timing['p95_ms']:>8.2f} {timing['throughput']:>9.1f}"
+        )
+        if agreed < args.min_agreement:
+            failed.append(name)
+            for text, p, r in zip(texts, predictions, reference):
+                if p != r:
+                    print(f"    disagree: {text!r}: reference={r.name} {name}={p.name}")
+
+    if failed:
+        print(f"\nParity below {args.min_agreement:.0%}: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
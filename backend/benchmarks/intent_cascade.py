@@ -0,0 +1,73 @@
+"""
+Evaluate the fast-path intent cascade on a labeled set.
+
+Reports how much traffic each stage handles (overall and per intent),
+the rule stage's precision, and - unless --rules-only - accuracy of the
+model alone vs. the cascade, so the accuracy delta of every rule set is
+visible before it is enabled.
+
+    cd backend && python -m benchmarks.intent_cascade
+    python -m benchmarks.intent_cascade --fast-path GREETING --backend onnx_int8
+"""
+
+import argparse
+from collections import Counter
+
+from benchmarks.intent_backends import DEFAULT_LABELED, load_labeled
+from inference.fast_path import INTENT_FAST_PATH, FastPathRouter
+from inference.service import BACKENDS, load_backend
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--labeled", default=DEFAULT_LABELED, help="JSONL with text / intent per line")
+    parser.add_argument("--fast-path", default=INTENT_FAST_PATH, help="Comma-separated intents with rules enabled")
+    parser.add_argument("--backend", default="torch", choices=BACKENDS)
+    parser.add_argument("--rules-only", action="store_true", help="Skip the model; report rule coverage / precision")
+    args = parser.parse_args()
+
+    labeled = load_labeled(args.labeled)
+    router = FastPathRouter(args.fast_path)
+    print(f"{len(labeled)} labeled messages, fast path for: {', '.join(router.intents) or '(none)'}\n")
+
+    rule_predictions = [router.classify(text) for text, _ in labeled]
+
+    handled = Counter()
+    correct = Counter()
+    totals = Counter(label for _, label in labeled)
+    for (text, label), predicted in zip(labeled, rule_predictions):
+        if predicted is None:
+            continue
+        handled[predicted.name] += 1
+        if predicted.name == label:
+            correct[predicted.name] += 1
+        else:
+            print(f"  rule mistake: {text!r}: {predicted.name} (label {label})")
+
+    n_handled = sum(handled.values())
+    print(f"fast path handled {n_handled}/{len(labeled)} ({n_handled / len(labeled):.1%}), "
+          f"precision {sum(correct.values()) / n_handled if n_handled else 0:.1%}")
+    print(f"{'intent':<26} {'handled':>8} {'of label':>9} {'precision':>10}")
+    for name in sorted(set(handled) | set(router.intents)):
+        h = handled[name]
+        print(f"{name:<26} {h:>8} {totals[name]:>9} {correct[name] / h if h else 0:>10.1%}")
+
+    if args.rules_only:
+        return
+
+    backend = load_backend(args.backend)
+    model_predictions = backend.predict_batch([text for text, _ in labeled])
+    cascade_predictions = [r if r is not None else m for r, m in zip(rule_predictions, model_predictions)]
+
+    labels = [label for _, label in labeled]
+    model_acc = sum(p.name == l for p, l in zip(model_predictions, labels)) / len(labels)
+    cascade_acc = sum(p.name == l for p, l in zip(cascade_predictions, labels)) / len(labels)
+    changed = sum(r is not None and r != m for r, m in zip(rule_predictions, model_predictions))
+
+    print(f"\nmodel ({args.backend}) accuracy   {model_acc:.1%}")
+    print(f"cascade accuracy          {cascade_acc:.1%}  (delta {cascade_acc - model_acc:+.1%})")
+    print(f"model calls avoided       {n_handled}/{len(labeled)}; rule overrode model on {changed}")
+
+
+if __name__ == "__main__":
+    main()
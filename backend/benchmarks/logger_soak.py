@@ -0,0 +1,81 @@
+"""
+Soak test: open many session loggers and check that descriptors stay bounded.
+
+Every session gets its session logger and its user's workflow logger and
+writes a line to each, as one /chat turn does. Open descriptors, registry
+sizes and the logging manager's dict are printed at checkpoints. The run
+fails if descriptors outgrow the two registry caps.
+
+Logs go to a temporary LOG_DIR, removed afterwards unless --keep is given.
+
+    cd backend && python -m benchmarks.logger_soak --sessions 100000
+"""
+
+import argparse
+import logging
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--checkpoints", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary log directory")
+    args = parser.parse_args()
+
+    log_dir = tempfile.mkdtemp(prefix="logger-soak-")
+    os.environ["LOG_DIR"] = log_dir
+
+    # Imported after LOG_DIR is set: the sink reads it on import
+    from utils.logging_utils.registry import open_fd_count
+    from utils.logging_utils.session_logger import get_session_logger, session_logger_stats
+    from utils.logging_utils.workflow_logger import get_workflow_logger, workflow_logger_stats
+
+    baseline_fds = open_fd_count()
+    baseline_loggers = len(logging.Logger.manager.loggerDict)
+    fd_limit = session_logger_stats()["max_entries"] + workflow_logger_stats()["max_entries"]
+    every = max(1, args.sessions // args.checkpoints)
+    peak_fds = baseline_fds or 0
+
+    print(f"log dir {log_dir}, baseline fds {baseline_fds}, logger caps {fd_limit}")
+    started = time.perf_counter()
+    try:
+        for i in range(1, args.sessions + 1):
+            user_id = str(i % args.users)
+            get_session_logger(f"soak-{i}", user_id).info("turn %d", i)
+            get_workflow_logger(user_id).info("workflow for turn %d", i)
+
+            if i % every == 0 or i == args.sessions:
+                fds = open_fd_count()
+                peak_fds = max(peak_fds, fds or 0)
+                session = session_logger_stats()
+                workflow = workflow_logger_stats()
+                rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+                print(
+                    f"{i:>8} sessions  {time.perf_counter() - started:6.1f}s  fds {fds}  "
+                    f"session loggers {session['entries']} (closed {session['closed']})  "
+                    f"workflow loggers {workflow['entries']} (closed {workflow['closed']})  "
+                    f"manager dict {len(logging.Logger.manager.loggerDict) - baseline_loggers:+d}  "
+                    f"max rss {rss_mb:.0f}MB"
+                )
+    finally:
+        if not args.keep:
+            shutil.rmtree(log_dir, ignore_errors=True)
+
+    if baseline_fds is None:
+        print("open descriptors not measurable on this platform")
+        return
+    growth = peak_fds - baseline_fds
+    print(f"peak descriptor growth {growth} (limit {fd_limit})")
+    if growth > fd_limit:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
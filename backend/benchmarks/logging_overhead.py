@@ -0,0 +1,136 @@
+"""
+Benchmark: per-request logging cost, synchronous file handlers vs the
+queued background writer.
+
+Each simulated request logs what one /chat turn does: about ten session
+logger lines (ContextAgent, IntentAgent) and five workflow logger lines
+(workflow + rephrase), across a rotating set of sessions and users. Time is
+measured on the calling thread only, i.e. the latency logging adds to the
+request. The async run also reports how long the writer needed to drain.
+
+    cd backend && python -m benchmarks.logging_overhead --requests 10000
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+from utils.logging_utils.async_writer import LogWriter
+from utils.logging_utils.registry import LoggerRegistry
+
+FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def file_factory(log_dir: str):
+    def attach(key, logger: logging.Logger) -> None:
+        directory = os.path.join(log_dir, *map(str, key if isinstance(key, tuple) else (key,)))
+        os.makedirs(directory, exist_ok=True)
+        handler = RotatingFileHandler(
+            os.path.join(directory, "bench.log"),
+            maxBytes=5 * 1024 * 1024,
+            backupCount=3,
+            encoding="utf-8",
+            delay=True,
+        )
+        handler.setFormatter(logging.Formatter(FORMAT))
+        logger.addHandler(handler)
+    return attach
+
+
+def one_request(session_logger: logging.Logger, workflow_logger: logging.Logger, i: int) -> None:
+    session_logger.info("=" * 70)
+    session_logger.info("CONTEXT AGENT - Processing message")
+    session_logger.info("=" * 70)
+    session_logger.info("Current user message: %s", f"is Nurofen in stock in Haifa? #{i}")
+    session_logger.info("Previous user message: %s", "what are the side effects of Nurofen?")
+    session_logger.info("Previous agent message: %s", "Nurofen (ibuprofen) may cause stomach upset " * 3)
+    session_logger.info("Rephrasing with context (%s)", "reference")
+    session_logger.info("Message was already clear - no changes needed")
+    session_logger.info("Intent: %s", "STOCK_CHECK")
+    session_logger.info("Workflow executed successfully")
+    workflow_logger.info("Rephrasing: %s", "is it in stock?")
+    workflow_logger.info("Checking stock for medication %d", 42)
+    workflow_logger.info("Store %s has %d units", "Haifa", 17)
+    workflow_logger.info("Stock lookup finished in %.1fms", 3.2)
+    workflow_logger.info("Response prepared")
+
+
+def run(label: str, args, writer: LogWriter | None) -> None:
+    log_dir = tempfile.mkdtemp(prefix="logging-bench-")
+    queued = writer is not None
+    sessions = LoggerRegistry(
+        file_factory(os.path.join(log_dir, "s")), args.sessions, None, queued=queued, writer=writer
+    )
+    workflows = LoggerRegistry(
+        file_factory(os.path.join(log_dir, "w")), args.users, None, queued=queued, writer=writer
+    )
+
+    timings = []
+    try:
+        started = time.perf_counter()
+        for i in range(args.requests):
+            user = i % args.users
+            session_logger = sessions.get((user, i % args.sessions), f"bench-session.{i % args.sessions}")
+            workflow_logger = workflows.get(user, f"bench-workflow.{user}")
+            t0 = time.perf_counter()
+            one_request(session_logger, workflow_logger, i)
+            timings.append((time.perf_counter() - t0) * 1e6)
+            if args.interval_ms:
+                time.sleep(args.interval_ms / 1000)
+        wall = time.perf_counter() - started
+
+        drain = 0.0
+        if writer is not None:
+            t0 = time.perf_counter()
+            writer.stop(timeout=120)
+            drain = time.perf_counter() - t0
+    finally:
+        sessions.clear()
+        workflows.clear()
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+    print(f"{label}")
+    print(
+        f"  per request p50 {statistics.median(timings):7.1f}us  p95 {percentile(timings, 95):7.1f}us  "
+        f"p99 {percentile(timings, 99):7.1f}us  max {max(timings):9.1f}us"
+    )
+    print(f"  wall {wall:.2f}s for {args.requests} requests", end="")
+    if writer is not None:
+        stats = writer.stats()
+        print(
+            f", drain {drain * 1000:.0f}ms, written {stats['written']}, dropped {stats['dropped']}, "
+            f"batches {stats['batches']} (avg {stats['written'] / max(1, stats['batches']):.0f} records)"
+        )
+    else:
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    parser.add_argument(
+        "--interval-ms", type=float, default=0.5,
+        help="Pause between requests; 0 logs flat out and overloads the writer",
+    )
+    args = parser.parse_args()
+
+    run("sync file handlers", args, None)
+    run("queued writer, drop policy", args, LogWriter(max_queue=args.queue_size, policy="drop"))
+    run("queued writer, block policy", args, LogWriter(max_queue=args.queue_size, policy="block"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Benchmark: SQL LIKE lookup vs in-memory catalog (exact + trigram fuzzy).
+
+Builds a synthetic catalog in a temporary SQLite file and times both
+approaches on exact-name, typo and no-match messages. Each message has an
+expected medication id (None for no-match), and every lookup is scored
+against it: precision is the share of returned medications that are the
+expected one. The no-match messages are ordinary customer questions whose
+longer words are not in FUZZY_SKIP_WORDS, so they go all the way through
+the substring and fuzzy stages instead of stopping early.
+
+    cd backend && python -m benchmarks.medication_lookup --skus 50000
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import tempfile
+import time
+
+from utils.db import db
+
+CONSONANTS = "bcdfghklmnprstvxz"
+VOWELS = "aeiou"
+
+
+def make_name(rng: random.Random) -> str:
+    """Pronounceable pseudo brand name, e.g. "Zovaprex"."""
+    name = "".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(rng.randint(3, 4)))
+    if rng.random() < 0.6:
+        name += rng.choice(CONSONANTS)
+    return name.capitalize()
+
+
+def make_typo(rng: random.Random, word: str) -> str:
+    i = rng.randrange(1, len(word) - 1)
+    op = rng.choice(("drop", "swap", "double"))
+    if op == "drop":
+        return word[:i] + word[i + 1:]
+    if op == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + word[i] + word[i:]
+
+
+# Customer messages that name no medication. Every one has words of
+# MIN_FUZZY_WORD_LENGTH+ letters outside FUZZY_SKIP_WORDS, and none has a
+# word shaped like the synthetic consonant-vowel names (which would stop
+# at the substring stage), so lookups reach the fuzzy stage and any result
+# is a false match.
+NO_MATCH_MESSAGES = (
+    "my package arrived broken yesterday",
+    "i want to change the delivery address of my order",
+    "when do you close on friday evening",
+    "i lost my insurance card, what should i do",
+    "how do i change my account password",
+    "the website keeps showing an error at checkout",
+    "is parking free at the haifa branch",
+    "do you accept credit cards by phone",
+    "my daughter woke up with a high temperature",
+    "could someone call me back tomorrow morning",
+    "מתי אתם פתוחים ביום שישי",
+    "איפה הסניף הכי קרוב אליי",
+    "ההזמנה שלי לא הגיעה עדיין",
+)
+
+
+def build_db(path: str, skus: int, rng: random.Random) -> list[tuple[str, str]]:
+    db.DB_PATH = path
+    db.init_schema()
+    names = []
+    seen = set()
+    while len(names) < skus:
+        brand, generic = make_name(rng), make_name(rng)
+        if brand in seen or generic in seen:
+            continue
+        seen.update((brand, generic))
+        names.append((brand, generic))
+
+    c = db.conn()
+    c.executemany(
+        "INSERT INTO medications VALUES (?,?,?,?,?,?,?,?,?)",
+        [
+            (f"m{i}", brand, generic, generic, 0, "Tablet", "10mg", "", "")
+            for i, (brand, generic) in enumerate(names)
+        ],
+    )
+    c.commit()
+    c.close()
+    return names
+
+
+def like_lookup(query: str):
+    """The previous get_medication_by_name: one LIKE scan per word."""
+    cleaned = re.sub(r"[^a-zA-Z0-9\s]", "", query.lower())
+    with db.connection() as c:
+        cur = c.cursor()
+        for word in cleaned.split():
+            if len(word) < 3:
+                continue
+            like = f"%{word}%"
+            cur.execute(
+                "SELECT * FROM medications WHERE lower(brand_name) LIKE ? OR lower(generic_name) LIKE ? LIMIT 1",
+                (like, like),
+            )
+            row = cur.fetchone()
+            if row:
+                return row["id"]
+    return None
+
+
+def timed(fn, queries: list[tuple[str, str | None]]) -> tuple[list[float], int, int]:
+    """Latencies, medications returned, and how many of those were the expected one."""
+    durations, found, correct = [], 0, 0
+    for q, expected_id in queries:
+        started = time.perf_counter()
+        result = fn(q)
+        durations.append((time.perf_counter() - started) * 1000)
+        if result is not None:
+            found += 1
+            correct += result == expected_id
+    return durations, found, correct
+
+
+def report(label: str, durations: list[float], found: int, correct: int):
+    durations = sorted(durations)
+    p99 = durations[int(len(durations) * 0.99) - 1]
+    precision = f"{correct / found:7.1%}" if found else "      -"
+    print(
+        f"  {label:<10} p50={statistics.median(durations):8.3f}ms "
+        f"p99={p99:8.3f}ms  found={found}/{len(durations)} "
+        f"correct={correct}/{len(durations)} precision={precision}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skus", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        names = build_db(os.path.join(tmp, "bench.db"), args.skus, rng)
+
+        # Import after DB_PATH is pointed at the benchmark database
+        from utils.medication.catalog import MedicationCatalog
+
+        catalog = MedicationCatalog()
+        catalog.load()
+        print(f"catalog: {args.skus} SKUs loaded in {catalog.last_load_ms:.0f}ms")
+
+        # (name, expected medication id)
+        sample = []
+        for _ in range(args.queries):
+            i = rng.randrange(len(names))
+            sample.append((names[i][rng.randrange(2)], f"m{i}"))
+        workloads = {
+            "exact": [(f"is {name.lower()} in stock", med_id) for name, med_id in sample],
+            "typo": [(f"is {make_typo(rng, name.lower())} in stock", med_id) for name, med_id in sample],
+            "no match": [(rng.choice(NO_MATCH_MESSAGES), None) for _ in range(args.queries)],
+        }
+
+        def catalog_lookup(q):
+            record = catalog.resolve(q)
+            return record["id"] if record else None
+
+        for workload, queries in workloads.items():
+            print(f"{workload}:")
+            report("LIKE", *timed(like_lookup, queries))
+            report("catalog", *timed(catalog_lookup, queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Micro-batching front end for a batch-capable predictor.
+
+Callers submit one input each and get a Future back. A single worker
+thread collects requests into length buckets and flushes a bucket as one
+`predict_batch` call when it is full or its oldest request has waited
+`max_wait_ms`. Grouping by length keeps padding inside a batch small.
+"""
+
+import bisect
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from utils.metrics.registry import METRICS
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+logger = logging.getLogger(__name__)
+
+
+class BatcherClosed(RuntimeError):
+    """Raised when submitting to a batcher that has been shut down."""
+
+
+class _Request:
+    __slots__ = ("item", "future", "enqueued_at")
+
+    def __init__(self, item):
+        self.item = item
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+
+    def __init__(
+        self,
+        predict_batch,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        bucket_edges: tuple[int, ...] = (32, 64, 128, 256),
+        length_fn=len,
+        name: str = "inference",
+    ):
+        """
+        :param predict_batch: list of inputs -> list of outputs, same order
+        :param bucket_edges: upper bounds of `length_fn(item)` per bucket
+        """
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.bucket_edges = tuple(bucket_edges)
+        self.length_fn = length_fn
+        self.name = name
+
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name=f"{name}-batcher", daemon=True)
+        self._thread.start()
+
+    # ---- Client side ----
+
+    def submit(self, item) -> Future:
+        if self._closed:
+            raise BatcherClosed(f"{self.name} batcher is closed")
+        request = _Request(item)
+        self._queue.put(request)
+        return request.future
+
+    def predict(self, item, timeout: float | None = None):
+        """Blocking single-item prediction through the batcher."""
+        return self.submit(item).result(timeout)
+
+    def close(self, timeout: float = 5) -> None:
+        """Flush pending requests and stop the worker."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # ---- Worker side ----
+
+    def _bucket(self, item) -> int:
+        return bisect.bisect_left(self.bucket_edges, self.length_fn(item))
+
+    def _loop(self):
+        pending: dict[int, list[_Request]] = {}
+
+        while True:
+            if pending:
+                oldest = min(reqs[0].enqueued_at for reqs in pending.values())
+                timeout = max(0.0, oldest + self.max_wait - time.perf_counter())
+            else:
+                timeout = None
+
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                request = False
+
+            # Take everything that queued up while the last batch ran
+            while request is not None:
+                if request:
+                    key = self._bucket(request.item)
+                    bucket = pending.setdefault(key, [])
+                    bucket.append(request)
+                    if len(bucket) >= self.max_batch_size:
+                        self._run(pending.pop(key))
+                try:
+                    request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if request is None:
+                for reqs in pending.values():
+                    self._run(reqs)
+                return
+
+            now = time.perf_counter()
+            for key in [k for k, reqs in pending.items() if reqs[0].enqueued_at + self.max_wait <= now]:
+                self._run(pending.pop(key))
+
+    def _run(self, requests: list[_Request]) -> None:
+        started = time.perf_counter()
+        wait_hist = METRICS.histogram(f"{self.name}.queue_wait_ms")
+        for r in requests:
+            wait_hist.observe((started - r.enqueued_at) * 1000)
+        METRICS.histogram(f"{self.name}.batch_size", BATCH_SIZE_BUCKETS).observe(len(requests))
+        METRICS.counter(f"{self.name}.batches").inc()
+        METRICS.counter(f"{self.name}.requests").inc(len(requests))
+
+        try:
+            outputs = self.predict_batch([r.item for r in requests])
+            if len(outputs) != len(requests):
+                raise RuntimeError(
+                    f"predict_batch returned {len(outputs)} results for {len(requests)} inputs"
+                )
+        except Exception as e:
+            logger.exception("Batched prediction failed (%d requests)", len(requests))
+            METRICS.counter(f"{self.name}.errors").inc()
+            for r in requests:
+                r.future.set_exception(e)
+            return
+        finally:
+            METRICS.histogram(f"{self.name}.forward_ms").observe((time.perf_counter() - started) * 1000)
+
+        for r, output in zip(requests, outputs):
+            r.future.set_result(output)
@@ -0,0 +1,75 @@
+"""
+Export the PyTorch intent classifier to ONNX and quantize it to int8.
+
+    cd backend && python -m inference.export_onnx
+    INTENT_BACKEND=onnx_int8 uvicorn app:app
+
+Writes model.onnx, model.int8.onnx (dynamic int8 weights for the
+Linear / MatMul layers), the tokenizer and config.json to --out-dir.
+"""
+
+import argparse
+import os
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from inference.onnx_backend import ONNX_FP32_FILE, ONNX_INT8_FILE
+from inference.service import INTENT_MODEL_DIR, INTENT_ONNX_DIR
+
+
+def export(model_dir: str, out_dir: str, opset: int = 17) -> str:
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    model.eval()
+
+    os.makedirs(out_dir, exist_ok=True)
+    tokenizer.save_pretrained(out_dir)
+    model.config.save_pretrained(out_dir)
+
+    sample = tokenizer(["is acamol in stock?"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    path = os.path.join(out_dir, ONNX_FP32_FILE)
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+    return path
+
+
+def quantize(fp32_path: str, out_dir: str) -> str:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    path = os.path.join(out_dir, ONNX_INT8_FILE)
+    quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model-dir", default=INTENT_MODEL_DIR)
+    parser.add_argument("--out-dir", default=INTENT_ONNX_DIR)
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--no-quantize", action="store_true")
+    args = parser.parse_args()
+
+    fp32_path = export(args.model_dir, args.out_dir, args.opset)
+    print(f"Exported {fp32_path} ({os.path.getsize(fp32_path) / 1e6:.1f} MB)")
+
+    if not args.no_quantize:
+        int8_path = quantize(fp32_path, args.out_dir)
+        print(f"Quantized {int8_path} ({os.path.getsize(int8_path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
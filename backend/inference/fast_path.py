@@ -0,0 +1,122 @@
+"""
+Rule-based first stage of the intent cascade.
+
+Messages that are obviously a greeting, or a plain refill or support
+request, are answered here; everything else (including anything
+ambiguous) falls through to the BERT model. Rules are deliberately
+high-precision: greetings must consist only of greeting words, and
+refill / support - whose workflows write data - need an imperative
+request phrase at the start of the message and must not look like a
+question ("what's the status of my refill request?", "customer service
+hours?"). Thanks / goodbyes are left to the model: the GREETING workflow
+answers with a welcome.
+
+INTENT_FAST_PATH lists the intents whose rules are active
+("GREETING,REFILL_REQUEST,SUPPORT" by default, "" disables the stage).
+"""
+
+import logging
+import os
+import re
+
+from bert.labels import Intent
+from utils.medication.catalog import normalize
+
+INTENT_FAST_PATH = os.environ.get("INTENT_FAST_PATH", "GREETING,REFILL_REQUEST,SUPPORT")
+
+# Longest message (in words) the greeting rule accepts
+MAX_GREETING_WORDS = 6
+
+# A greeting must contain one of these...
+GREETING_ANCHORS = frozenset({
+    "hi", "hello", "hey", "heya", "hiya", "morning", "afternoon", "evening", "shalom",
+    "שלום", "היי", "הי", "אהלן", "הלו", "בוקר", "ערב", "צהריים", "שלומך", "נשמע",
+})
+# ...and consist only of anchors and these filler words
+GREETING_FILLERS = frozenset({
+    "good", "there", "all", "everyone", "again",
+    "טוב", "מה", "לכולם", "שוב", "אחי",
+})
+
+# Side-effect rules: anchored at the start, imperative / "I want to ..." only
+_WANT_EN = r"(i want|i need|i would like|id like)"
+_WANT_HE = r"(אני )?(רוצה|צריך|צריכה)"
+
+REFILL_PATTERNS = (
+    r"^(please )?(refill|renew) my\b",
+    rf"^(please )?{_WANT_EN}( a| to)? (refill|renew)\b",
+    rf"^{_WANT_HE} (לחדש|חידוש) (את )?(ה)?מרשם",
+    r"^(בבקשה )?(תחדש|תחדשי|תחדשו) (לי )?(את )?(ה)?מרשם",
+)
+
+SUPPORT_PATTERNS = (
+    r"^(please )?(open|file|submit) a (support )?(ticket|complaint)\b",
+    rf"^(please )?{_WANT_EN} to (open|file|submit) a (support )?(ticket|complaint)\b",
+    rf"^(please )?{_WANT_EN} to (talk|speak) (to|with) (a |an )?(human|person|representative)\b",
+    rf"^{_WANT_HE} (לפתוח|להגיש) (פנייה|קריאה|תלונה)",
+    rf"^{_WANT_HE} (לדבר|לשוחח) עם נציג",
+)
+
+# Words that make a message a question about a request rather than the request itself
+QUESTION_WORDS = frozenset({
+    "status", "did", "does", "do", "has", "have", "is", "was", "how", "when", "where",
+    "what", "whats", "why", "which", "hours", "already", "can", "could",
+    "סטטוס", "האם", "מה", "מתי", "איך", "איפה", "למה", "שעות", "כבר", "הוגשה", "נפתחה",
+})
+
+logger = logging.getLogger(__name__)
+
+
+def _is_question(raw: str, words: list[str]) -> bool:
+    return "?" in raw or any(w in QUESTION_WORDS for w in words)
+
+
+def _is_greeting(words: list[str]) -> bool:
+    if not words or len(words) > MAX_GREETING_WORDS:
+        return False
+    if not any(w in GREETING_ANCHORS for w in words):
+        return False
+    return all(w in GREETING_ANCHORS or w in GREETING_FILLERS for w in words)
+
+
+class FastPathRouter:
+
+    def __init__(self, enabled: str = INTENT_FAST_PATH):
+        names = {n.strip().upper() for n in enabled.split(",") if n.strip()}
+        self.rules = []
+
+        if "GREETING" in names and "GREETING" in Intent.__members__:
+            self.rules.append((Intent.GREETING, lambda raw, text, words: _is_greeting(words)))
+
+        for name, patterns in (("REFILL_REQUEST", REFILL_PATTERNS), ("SUPPORT", SUPPORT_PATTERNS)):
+            if name not in names:
+                continue
+            if name not in Intent.__members__:
+                logger.warning("Fast path rules for %s skipped: not an Intent", name)
+                continue
+            compiled = re.compile("|".join(f"(?:{p})" for p in patterns))
+            self.rules.append((
+                Intent[name],
+                lambda raw, text, words, rx=compiled: (
+                    not _is_question(raw, words) and rx.search(text) is not None
+                ),
+            ))
+
+        unknown = names - {"GREETING", "REFILL_REQUEST", "SUPPORT"}
+        if unknown:
+            logger.warning("No fast path rules for: %s", ", ".join(sorted(unknown)))
+
+    @property
+    def intents(self) -> list[str]:
+        return [intent.name for intent, _ in self.rules]
+
+    def classify(self, text: str):
+        """The intent if a rule fires with certainty, else None."""
+        if not self.rules:
+            return None
+        normalized = normalize(text)
+        words = normalized.split()
+        for intent, rule in self.rules:
+            if rule(text, normalized, words):
+                return intent
+        return None
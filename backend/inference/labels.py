@@ -0,0 +1,29 @@
+"""
+Map a model's id2label config onto the Intent enum.
+"""
+
+from bert.labels import Intent
+
+
+def label_to_intent(label: str, index: int) -> Intent:
+    """
+    Resolve a config label to an Intent: by member name ("STOCK_CHECK"),
+    then by value, then - for unnamed "LABEL_<n>" configs - by position.
+    """
+    name = str(label).strip()
+    if name.upper() in Intent.__members__:
+        return Intent[name.upper()]
+    for intent in Intent:
+        if str(intent.value) == name:
+            return intent
+
+    members = list(Intent)
+    if name.upper().startswith("LABEL_") and index < len(members):
+        return members[index]
+    raise ValueError(f"Model label {label!r} does not match any Intent")
+
+
+def intents_from_config(id2label: dict) -> list[Intent]:
+    """Intent for every output index of the classifier head."""
+    ordered = sorted((int(i), label) for i, label in id2label.items())
+    return [label_to_intent(label, i) for i, label in ordered]
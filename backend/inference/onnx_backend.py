@@ -0,0 +1,62 @@
+"""
+ONNX Runtime backend for the BERT intent classifier.
+
+Runs a model exported by `python -m inference.export_onnx` (fp32 or
+dynamically int8-quantized). The export directory also holds the
+tokenizer and config, so bert/model_out is not needed at runtime.
+"""
+
+import json
+import logging
+import os
+import threading
+
+import onnxruntime as ort
+from transformers import AutoTokenizer
+
+from inference.labels import intents_from_config
+from inference.tokenizer_cache import CachedTokenizer
+
+ONNX_FP32_FILE = "model.onnx"
+ONNX_INT8_FILE = "model.int8.onnx"
+
+logger = logging.getLogger(__name__)
+
+
+class OnnxIntentBackend:
+
+    def __init__(self, model_dir: str, quantized: bool = True, max_length: int = 128, num_threads: int | None = None):
+        self.model_dir = model_dir
+        self.max_length = max_length
+        self.name = "onnx_int8" if quantized else "onnx"
+
+        model_path = os.path.join(model_dir, ONNX_INT8_FILE if quantized else ONNX_FP32_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"{model_path} not found - run `python -m inference.export_onnx` first"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.tokenizer_cache = CachedTokenizer(self.tokenizer, max_length)
+        with open(os.path.join(model_dir, "config.json"), encoding="utf-8") as f:
+            self.intents = intents_from_config(json.load(f)["id2label"])
+        self._lock = threading.Lock()
+
+        logger.info("Loaded %s intent model from %s (%d labels)", self.name, model_path, len(self.intents))
+
+    def tokenize(self, texts: list[str]) -> dict:
+        return self.tokenizer_cache.encode(texts)
+
+    def predict_batch(self, texts: list[str]) -> list:
+        encoded = self.tokenize(texts)
+        feeds = {k: v for k, v in encoded.items() if k in self.input_names}
+        with self._lock:
+            (logits,) = self.session.run(["logits"], feeds)
+        return [self.intents[i] for i in logits.argmax(axis=-1).tolist()]
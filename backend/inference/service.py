@@ -0,0 +1,271 @@
+"""
+Intent classification service.
+
+`classify_intent(text)` keeps the bert.classifier interface but routes
+every call through a MicroBatcher, so concurrent chat turns share batched
+forward passes instead of running one batch-size-1 pass each.
+
+INTENT_BACKEND selects the model runtime:
+  torch       full-precision PyTorch (default)
+  torch_int8  PyTorch with dynamic int8 Linear layers
+  onnx        ONNX Runtime, fp32 export
+  onnx_int8   ONNX Runtime, int8-quantized export
+The ONNX backends read INTENT_ONNX_DIR, produced by
+`python -m inference.export_onnx`.
+
+Results are cached per normalized message (case, whitespace, punctuation
+and niqqud folded), so "Hi!" and "hi" share one forward pass. Every
+INTENT_MODEL_CHECK_SECONDS the model directory is fingerprinted on a
+background thread; when its files change, that thread loads and warms the
+new backend while requests keep using the old one, then swaps it in and
+drops all caches.
+
+A rule-based fast path (inference/fast_path.py) answers obvious
+greetings and refill / support requests before any of this runs.
+
+INTENT_BATCHING=0 falls back to calling bert.classifier directly.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+
+from inference.batcher import MicroBatcher
+from inference.fast_path import FastPathRouter
+from utils.cache.lru import TTLCache
+from utils.medication.catalog import normalize
+from utils.metrics.registry import METRICS
+
+INTENT_BACKEND = os.environ.get("INTENT_BACKEND", "torch")
+INTENT_MODEL_DIR = os.environ.get("INTENT_MODEL_DIR", "bert/model_out")
+INTENT_ONNX_DIR = os.environ.get("INTENT_ONNX_DIR", "bert/model_onnx")
+INTENT_NUM_THREADS = int(os.environ.get("INTENT_NUM_THREADS", "0")) or None
+INTENT_BATCHING = os.environ.get("INTENT_BATCHING", "1") != "0"
+INTENT_BATCH_MAX_SIZE = int(os.environ.get("INTENT_BATCH_MAX_SIZE", "16"))
+INTENT_BATCH_MAX_WAIT_MS = float(os.environ.get("INTENT_BATCH_MAX_WAIT_MS", "5"))
+INTENT_MAX_LENGTH = int(os.environ.get("INTENT_MAX_LENGTH", "128"))
+INTENT_TIMEOUT_SECONDS = float(os.environ.get("INTENT_TIMEOUT_SECONDS", "10"))
+INTENT_CACHE_ENTRIES = int(os.environ.get("INTENT_CACHE_ENTRIES", "10000"))
+INTENT_CACHE_TTL_SECONDS = float(os.environ.get("INTENT_CACHE_TTL_SECONDS", str(24 * 3600)))
+INTENT_MODEL_CHECK_SECONDS = float(os.environ.get("INTENT_MODEL_CHECK_SECONDS", "30"))
+
+# Dummy inputs for warmup: short / long, English / Hebrew
+WARMUP_TEXTS = (
+    "hi",
+    "is acamol in stock?",
+    "יש לכם נורופן בסניף תל אביב?",
+    "I would like to know the dosage instructions and warnings for Glucophage 500mg tablets",
+)
+
+logger = logging.getLogger(__name__)
+
+_SERVICE = None
+_SERVICE_LOCK = threading.Lock()
+_FAST_PATH = FastPathRouter()
+
+
+def model_fingerprint(model_dir: str) -> str | None:
+    """Hash of every file's path, size and mtime under `model_dir` (None if missing)."""
+    if not os.path.isdir(model_dir):
+        return None
+    digest = hashlib.sha256()
+    for root, _, files in sorted(os.walk(model_dir)):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{os.path.relpath(path, model_dir)}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+class IntentService:
+
+    def __init__(
+        self,
+        backend,
+        max_batch_size: int = INTENT_BATCH_MAX_SIZE,
+        max_wait_ms: float = INTENT_BATCH_MAX_WAIT_MS,
+        check_interval: float = INTENT_MODEL_CHECK_SECONDS,
+    ):
+        self.backend = backend
+        self.batcher = MicroBatcher(
+            self._predict_batch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            name="intent",
+        )
+        self.results = TTLCache(max_entries=INTENT_CACHE_ENTRIES, ttl_seconds=INTENT_CACHE_TTL_SECONDS)
+
+        self.check_interval = check_interval
+        self.fingerprint = model_fingerprint(backend.model_dir)
+        self._checked_at = time.monotonic()
+        self._reload_lock = threading.Lock()
+        # Bumped on reload so results computed by the old model are not cached
+        self.generation = 0
+        self.reloads = 0
+
+    def _predict_batch(self, texts: list[str]) -> list:
+        # Looked up per batch so a reloaded backend takes over immediately
+        return self.backend.predict_batch(texts)
+
+    def _check_model_dir(self) -> None:
+        """Start a background check when one is due; never blocks the caller."""
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        self._checked_at = time.monotonic()
+        try:
+            threading.Thread(target=self._reload_if_changed, name="intent-model-reload", daemon=True).start()
+        except Exception:
+            self._reload_lock.release()
+            logger.exception("Could not start the intent model reload check")
+
+    def _reload_if_changed(self) -> None:
+        """Runs on its own thread, holding _reload_lock; requests keep the old model meanwhile."""
+        try:
+            fingerprint = model_fingerprint(self.backend.model_dir)
+            if fingerprint is None or fingerprint == self.fingerprint:
+                return
+
+            logger.info("Intent model directory %s changed - loading the new model", self.backend.model_dir)
+            backend = load_backend(self.backend.name)
+            self._warm(backend)
+
+            # Swap: every batch from here on runs on the new backend
+            self.backend = backend
+            self.fingerprint = fingerprint
+            self.generation += 1
+            self.results.clear()
+            self.reloads += 1
+            logger.info("Intent model reloaded (generation %d)", self.generation)
+        except Exception:
+            logger.exception("Intent model reload failed - keeping the loaded model")
+        finally:
+            self._reload_lock.release()
+
+    def classify(self, text: str):
+        self._check_model_dir()
+
+        key = normalize(text)
+        intent = self.results.get(key)
+        if intent is not None:
+            return intent
+
+        generation = self.generation
+        intent = self.batcher.predict(text, timeout=INTENT_TIMEOUT_SECONDS)
+        if generation == self.generation:
+            self.results.set(key, intent)
+        return intent
+
+    def warmup(self) -> None:
+        """
+        Run dummy batches at batch size 1 and at the max batch size, so
+        kernel selection / graph init happens before the first real request.
+        Goes straight to the backend, so the result cache stays empty.
+        """
+        self._warm(self.backend)
+
+    def _warm(self, backend) -> None:
+        for size in sorted({1, self.batcher.max_batch_size}):
+            texts = [WARMUP_TEXTS[i % len(WARMUP_TEXTS)] for i in range(size)]
+            backend.predict_batch(texts)
+
+    def close(self):
+        self.batcher.close()
+
+    def stats(self) -> dict:
+        tokenizer_cache = getattr(self.backend, "tokenizer_cache", None)
+        return {
+            "backend": self.backend.name,
+            "model_dir": self.backend.model_dir,
+            "model_fingerprint": self.fingerprint,
+            "reloads": self.reloads,
+            "reloading": self._reload_lock.locked(),
+            "max_batch_size": self.batcher.max_batch_size,
+            "max_wait_ms": self.batcher.max_wait * 1000,
+            "fast_path_intents": _FAST_PATH.intents,
+            "result_cache": self.results.stats(),
+            "tokenizer_cache": tokenizer_cache.stats() if tokenizer_cache else None,
+        }
+
+
+BACKENDS = ("torch", "torch_int8", "onnx", "onnx_int8")
+
+
+def load_backend(name: str = INTENT_BACKEND):
+    """Instantiate an intent backend by name (heavy imports happen here)."""
+    if name in ("torch", "torch_int8"):
+        from inference.torch_backend import TorchIntentBackend
+
+        return TorchIntentBackend(
+            INTENT_MODEL_DIR,
+            max_length=INTENT_MAX_LENGTH,
+            num_threads=INTENT_NUM_THREADS,
+            quantize=name == "torch_int8",
+        )
+
+    if name in ("onnx", "onnx_int8"):
+        from inference.onnx_backend import OnnxIntentBackend
+
+        return OnnxIntentBackend(
+            INTENT_ONNX_DIR,
+            quantized=name == "onnx_int8",
+            max_length=INTENT_MAX_LENGTH,
+            num_threads=INTENT_NUM_THREADS,
+        )
+
+    raise ValueError(f"Unknown INTENT_BACKEND {name!r}; expected one of {', '.join(BACKENDS)}")
+
+
+def get_intent_service() -> IntentService:
+    global _SERVICE
+    if _SERVICE is None:
+        with _SERVICE_LOCK:
+            if _SERVICE is None:
+                _SERVICE = IntentService(load_backend())
+    return _SERVICE
+
+
+def classify_intent(text: str):
+    intent = _FAST_PATH.classify(text)
+    if intent is not None:
+        METRICS.counter("intent.stage.fast_path").inc()
+        METRICS.counter(f"intent.stage.fast_path.{intent.name}").inc()
+        return intent
+
+    METRICS.counter("intent.stage.model").inc()
+    return classify_with_model(text)
+
+
+def classify_with_model(text: str):
+    """Classify with the model only, skipping the fast path."""
+    if not INTENT_BATCHING:
+        from bert.classifier import classify_intent as classify_unbatched
+
+        return classify_unbatched(text)
+    return get_intent_service().classify(text)
+
+
+def warmup_intent_model() -> None:
+    """Load the configured model and push dummy batches through it."""
+    if INTENT_BATCHING:
+        get_intent_service().warmup()
+    else:
+        classify_with_model(WARMUP_TEXTS[0])
+
+
+def intent_service_stats() -> dict | None:
+    return _SERVICE.stats() if _SERVICE is not None else None
+
+
+def shutdown_intent_service():
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is not None:
+            _SERVICE.close()
+            _SERVICE = None
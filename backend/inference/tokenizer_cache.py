@@ -0,0 +1,46 @@
+"""
+Per-text cache of tokenizer output.
+
+Texts are tokenized once (unpadded) and cached; a batch is assembled by
+padding the cached encodings to the longest one. Repeated messages skip
+the tokenizer entirely.
+"""
+
+import numpy as np
+
+from utils.cache.lru import TTLCache
+
+
+class CachedTokenizer:
+
+    def __init__(self, tokenizer, max_length: int = 128, max_entries: int = 10000):
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.cache = TTLCache(max_entries=max_entries, ttl_seconds=None)
+        self.pad_id = tokenizer.pad_token_id or 0
+
+    def _encode_missing(self, texts: list[str]) -> None:
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        for i, text in enumerate(texts):
+            self.cache.set(text, {key: list(values[i]) for key, values in encoded.items()})
+
+    def encode(self, texts: list[str]) -> dict[str, np.ndarray]:
+        """Padded int64 arrays (input_ids, attention_mask, ...) for `texts`."""
+        encodings = [self.cache.get(text) for text in texts]
+        missing = list(dict.fromkeys(t for t, e in zip(texts, encodings) if e is None))
+        if missing:
+            self._encode_missing(missing)
+            encodings = [e if e is not None else self.cache.get(t) for t, e in zip(texts, encodings)]
+
+        width = max(len(e["input_ids"]) for e in encodings)
+        batch = {}
+        for key in encodings[0]:
+            fill = self.pad_id if key == "input_ids" else 0
+            rows = np.full((len(encodings), width), fill, dtype=np.int64)
+            for i, e in enumerate(encodings):
+                rows[i, :len(e[key])] = e[key]
+            batch[key] = rows
+        return batch
+
+    def stats(self) -> dict:
+        return self.cache.stats()
@@ -0,0 +1,51 @@
+"""
+PyTorch / Hugging Face backend for the BERT intent classifier.
+
+With `quantize=True` the Linear layers are dynamically quantized to int8
+(weights int8, activations quantized per batch), which needs no export
+step and keeps the same tokenizer and labels.
+"""
+
+import logging
+import threading
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from inference.labels import intents_from_config
+from inference.tokenizer_cache import CachedTokenizer
+
+logger = logging.getLogger(__name__)
+
+
+class TorchIntentBackend:
+
+    def __init__(self, model_dir: str, max_length: int = 128, num_threads: int | None = None, quantize: bool = False):
+        self.model_dir = model_dir
+        self.max_length = max_length
+        self.name = "torch_int8" if quantize else "torch"
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.tokenizer_cache = CachedTokenizer(self.tokenizer, max_length)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+        self.model.eval()
+        if quantize:
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        self.intents = intents_from_config(self.model.config.id2label)
+        # Only the batcher thread calls predict_batch, but direct callers may too
+        self._lock = threading.Lock()
+
+        logger.info("Loaded %s intent model from %s (%d labels)", self.name, model_dir, len(self.intents))
+
+    def tokenize(self, texts: list[str]) -> dict:
+        return {k: torch.from_numpy(v) for k, v in self.tokenizer_cache.encode(texts).items()}
+
+    def predict_batch(self, texts: list[str]) -> list:
+        encoded = self.tokenize(texts)
+        with self._lock, torch.inference_mode():
+            logits = self.model(**encoded).logits
+        return [self.intents[i] for i in logits.argmax(dim=-1).tolist()]
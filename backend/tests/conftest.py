@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+import pytest
+
+# Before anything imports the log sink: keep test logs out of ./logging
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="pharmacy-test-logs-"))
+
+from utils.db import db  # noqa: E402
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """A migrated, empty database in tmp_path behind a fresh connection pool."""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "pharmacy.db"))
+    monkeypatch.setattr(db, "_POOL", None)
+    db.init_schema()
+    yield db
+    if db._POOL is not None:
+        db._POOL.close_all()
+
+
+@pytest.fixture
+def seed(temp_db):
+    """`seed(users, per_user)` fills temp_db with rows for `users` users."""
+
+    def _seed(users: int = 3, per_user: int = 4) -> None:
+        c = temp_db.conn()
+        try:
+            _seed_rows(c, users, per_user)
+        finally:
+            c.close()
+
+    return _seed
+
+
+def _seed_rows(c, users: int, per_user: int) -> None:
+    cur = c.cursor()
+    for m in range(per_user):
+        cur.execute(
+            "INSERT INTO medications (id, brand_name, generic_name) VALUES (?, ?, ?)",
+            (f"med-{m}", f"Brand{m}", f"generic{m}"),
+        )
+        for s in range(3):
+            cur.execute(
+                "INSERT INTO stock (store_id, medication_id, quantity) VALUES (?, ?, ?)",
+                (f"store-{s}", f"med-{m}", 10 * s),
+            )
+    for u in range(users):
+        user_id = f"u{u}"
+        for i in range(per_user):
+            created_at = f"2026-01-{i + 1:02d}T10:00:00"
+            status = "pending" if i % 2 else "approved"
+            cur.execute(
+                "INSERT INTO prescription_requests "
+                "(id, user_id, medication_id, request_type, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (f"pr-{u}-{i}", user_id, f"med-{i}", "refill", status, created_at),
+            )
+            cur.execute(
+                "INSERT INTO support_requests (id, user_id, subject, message, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (f"sr-{u}-{i}", user_id, "subject", "message", status, created_at),
+            )
+            cur.execute(
+                "INSERT INTO prescriptions (id, user_id, medication_id, status, refills_left, expires_on) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (f"rx-{u}-{i}", user_id, f"med-{i}", "active" if i == 0 else "expired", 2, "2027-01-01"),
+            )
+            cur.execute(
+                "INSERT INTO medications_sold (id, medication_id, user_id, quantity, sold_at, "
+                "sold_year, sold_month, sold_day) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (f"ms-{u}-{i}", f"med-{i}", user_id, 1, f"2026-01-{i + 1:02d} 10:00:00", 2026, 1, i + 1),
+            )
+    c.commit()
@@ -0,0 +1,25 @@
+import pytest
+
+# app.py needs the full server stack (FastAPI, the LLM client, the intent model)
+pytest.importorskip("fastapi")
+pytest.importorskip("openai")
+pytest.importorskip("bert.labels")
+
+from app import load_dashboard_data  # noqa: E402
+from utils.db.db import track_queries  # noqa: E402
+
+# One query each for prescription requests (names joined in), support
+# requests and sales - never one per row
+DASHBOARD_QUERIES = 3
+
+
+@pytest.mark.parametrize("users", [1, 10, 50])
+def test_dashboard_query_count_does_not_grow_with_rows(seed, users):
+    seed(users=users, per_user=4)
+
+    with track_queries() as tracker:
+        data = load_dashboard_data()
+
+    assert len(data["prescriptions"]) == users * 4
+    assert all(p["medication_name"].startswith("Brand") for p in data["prescriptions"])
+    assert tracker.count == DASHBOARD_QUERIES, tracker.statements
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("bert.labels")
+
+from bert.labels import Intent  # noqa: E402
+from inference.fast_path import FastPathRouter  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def router():
+    return FastPathRouter("GREETING,REFILL_REQUEST,SUPPORT")
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("hello there", "GREETING"),
+    ("מה שלומך", "GREETING"),
+    ("I need a refill of my Glucophage prescription", "REFILL_REQUEST"),
+    ("Please refill my Ventolin", "REFILL_REQUEST"),
+    ("אני רוצה לחדש את המרשם שלי", "REFILL_REQUEST"),
+    ("I want to open a support ticket", "SUPPORT"),
+    ("I want to talk to a human", "SUPPORT"),
+    ("אני צריך לפתוח פנייה לשירות לקוחות", "SUPPORT"),
+])
+def test_obvious_requests_take_the_fast_path(router, text, intent):
+    assert router.classify(text) == Intent[intent]
+
+
+@pytest.mark.parametrize("text", [
+    # Questions about a request must never trigger the writing workflows
+    "what's the status of my refill request?",
+    "Did my refill request go through",
+    "how do I request a refill",
+    "refill request",
+    "what are your customer service hours?",
+    "support ticket",
+    "שירות לקוחות",
+    "מתי אפשר לחדש מרשם",
+    "מה הסטטוס של חידוש המרשם",
+    # Thanks are not greetings: the GREETING workflow answers with a welcome
+    "thank you",
+    "thanks so much",
+    "תודה רבה",
+])
+def test_questions_and_thanks_fall_through_to_the_model(router, text):
+    assert router.classify(text) is None
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from utils.medication.fuzzy_index import TrigramIndex
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+# Many equal-length keys over a tiny alphabet, so typos tie between keys
+SEARCH_SCRIPT = """
+import random
+from utils.medication.fuzzy_index import TrigramIndex
+
+rng = random.Random(0)
+index = TrigramIndex()
+for i in range(400):
+    index.add("".join(rng.choice("kmt") + rng.choice("ao") for _ in range(4)), i)
+for _ in range(300):
+    query = "".join(rng.choice("kmt") + rng.choice("ao") for _ in range(4))
+    j = rng.randrange(1, 7)
+    print(index.search(query[:j] + query[j + 1:]))
+"""
+
+
+@pytest.fixture
+def index():
+    index = TrigramIndex()
+    for key in ("nurofen", "ibuprofen", "kirived", "vuredit", "acamol"):
+        index.add(key, key)
+    return index
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("nurofn", "nurofen"),
+    ("ibuprofin", "ibuprofen"),
+    ("acamoll", "acamol"),
+])
+def test_typos_match(index, query, expected):
+    assert [value for _, value in index.search(query)] == [expected]
+
+
+@pytest.mark.parametrize("query", ["arrived", "credit", "thanks", "abc"])
+def test_words_sharing_only_an_ending_do_not_match(index, query):
+    assert index.search(query) == []
+
+
+def test_ties_go_to_the_key_indexed_first():
+    index = TrigramIndex()
+    for key in ("zovaprex", "zovaprek", "zovaprem"):
+        index.add(key, key)
+    assert [value for _, value in index.search("zovaprez", limit=3)] == ["zovaprex", "zovaprek", "zovaprem"]
+
+
+def test_results_do_not_depend_on_the_hash_seed():
+    outputs = []
+    for seed in ("1", "2"):
+        env = {**os.environ, "PYTHONHASHSEED": seed}
+        result = subprocess.run(
+            [sys.executable, "-c", SEARCH_SCRIPT],
+            cwd=BACKEND, env=env, capture_output=True, text=True, check=True,
+        )
+        outputs.append(result.stdout)
+    assert outputs[0] == outputs[1]
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+# Needs the original classifier (and its model); each backend case also
+# needs its own runtime
+pytest.importorskip("bert.classifier")
+
+from benchmarks.intent_backends import (  # noqa: E402
+    DEFAULT_LABELED,
+    MIN_AGREEMENT,
+    agreement,
+    load_labeled,
+    predict_all,
+    reference_predictions,
+)
+from inference.service import INTENT_ONNX_DIR, load_backend  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def labeled_texts():
+    return [text for text, _ in load_labeled(DEFAULT_LABELED)]
+
+
+@pytest.fixture(scope="module")
+def reference(labeled_texts):
+    return reference_predictions(labeled_texts)
+
+
+@pytest.mark.parametrize(
+    "name, runtime",
+    [
+        ("torch", "torch"),
+        ("torch_int8", "torch"),
+        ("onnx", "onnxruntime"),
+        ("onnx_int8", "onnxruntime"),
+    ],
+)
+def test_backend_matches_original_classifier(labeled_texts, reference, name, runtime):
+    pytest.importorskip(runtime)
+    if runtime == "onnxruntime":
+        from inference.onnx_backend import ONNX_FP32_FILE, ONNX_INT8_FILE
+
+        model_file = ONNX_INT8_FILE if name == "onnx_int8" else ONNX_FP32_FILE
+        if not os.path.exists(os.path.join(INTENT_ONNX_DIR, model_file)):
+            pytest.skip(f"{name} not exported - run `python -m inference.export_onnx`")
+
+    predictions = predict_all(load_backend(name), labeled_texts, batch_size=16)
+
+    disagreements = [
+        (text, r.name, p.name) for text, p, r in zip(labeled_texts, predictions, reference) if p != r
+    ]
+    assert agreement(predictions, reference) >= MIN_AGREEMENT, disagreements
@@ -0,0 +1,92 @@
+import logging
+
+import pytest
+
+from utils.logging_utils.async_writer import LogWriter
+from utils.logging_utils.registry import LoggerRegistry, open_fd_count
+
+MAX_LOGGERS = 16
+SESSIONS = 300
+
+
+@pytest.fixture
+def file_factory(tmp_path):
+    """One file handler per logger, like the old per-session log files."""
+
+    def attach(key, logger):
+        handler = logging.FileHandler(tmp_path / f"{key}.log", encoding="utf-8")
+        handler.setLevel(logging.INFO)
+        logger.addHandler(handler)
+
+    return attach
+
+
+@pytest.mark.parametrize("queued", [False, True])
+def test_many_sessions_keep_loggers_and_fds_bounded(file_factory, queued):
+    writer = LogWriter() if queued else None
+    registry = LoggerRegistry(file_factory, max_entries=MAX_LOGGERS, idle_seconds=None, queued=queued, writer=writer)
+    baseline_fds = open_fd_count()
+    peak_fds = baseline_fds
+
+    try:
+        for i in range(SESSIONS):
+            registry.get(f"session-{i}", f"test-session.{i}").info("turn %d", i)
+            if writer is not None and i % 50 == 0:
+                writer.stop()  # drain, so queued closes have happened
+            if baseline_fds is not None:
+                peak_fds = max(peak_fds, open_fd_count())
+
+        stats = registry.stats()
+        assert stats["entries"] <= MAX_LOGGERS
+        assert stats["created"] == SESSIONS
+        assert stats["closed"] == SESSIONS - stats["entries"]
+        # Never registered with the logging manager, so nothing accumulates there
+        assert not any(name.startswith("test-session.") for name in logging.Logger.manager.loggerDict)
+        if baseline_fds is not None:
+            # Queued closes may lag by one drain interval
+            slack = 50 if queued else 0
+            assert peak_fds - baseline_fds <= MAX_LOGGERS + slack
+    finally:
+        registry.clear()
+        if writer is not None:
+            writer.stop()
+
+    if baseline_fds is not None:
+        assert open_fd_count() <= baseline_fds
+
+
+def test_evicted_logger_flushes_its_lines(tmp_path, file_factory):
+    registry = LoggerRegistry(file_factory, max_entries=1, idle_seconds=None, queued=False)
+    registry.get("a", "test-session.a").info("first")
+    registry.get("b", "test-session.b").info("second")
+
+    assert (tmp_path / "a.log").read_text(encoding="utf-8") == "first\n"
+    registry.clear()
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(record.getMessage())
+
+
+def test_evicted_logger_still_reaches_the_shared_sink(file_factory):
+    sink = ListHandler()
+    sink.shared = True
+
+    def attach(key, logger):
+        file_factory(key, logger)
+        logger.addHandler(sink)
+
+    registry = LoggerRegistry(attach, max_entries=1, idle_seconds=None, queued=False)
+    held = registry.get("a", "test-session.a")
+    registry.get("b", "test-session.b")  # evicts "a" mid-request
+
+    held.info("after eviction")
+
+    assert sink.lines == ["after eviction"]
+    registry.clear()
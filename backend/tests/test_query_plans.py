@@ -0,0 +1,100 @@
+import pytest
+
+from utils.db.db import conn, track_queries
+from utils.medication.get_medications_sold import get_medications_sold
+from utils.prescription.get_all_prescription_requests import (
+    count_all_prescription_requests,
+    get_all_prescription_requests,
+)
+from utils.prescription.get_prescriptions_per_user import (
+    count_prescriptions_per_user,
+    get_prescription_per_user,
+)
+from utils.support.get_all_support_requests import get_all_support_requests
+from utils.support.get_support_per_user import count_support_per_user, get_support_per_user
+from workflows.refill_request import handle as refill_request
+from workflows.stock_check import check_stock_per_store
+
+CURSOR = ("2026-01-03T10:00:00", "pr-0-2")
+
+# Each case runs the real query function and names the index its SELECTs must use
+QUERIES = {
+    "prescriptions per user": (
+        lambda: get_prescription_per_user("u1", limit=2),
+        "ix_prescription_requests_user_created",
+    ),
+    "prescriptions per user by status": (
+        lambda: get_prescription_per_user("u1", status="pending", limit=2),
+        "ix_prescription_requests_user_status_created",
+    ),
+    "prescriptions per user after cursor": (
+        lambda: get_prescription_per_user("u1", limit=2, after=CURSOR),
+        "ix_prescription_requests_user_created",
+    ),
+    "count prescriptions per user": (
+        lambda: count_prescriptions_per_user("u1", status="pending"),
+        "ix_prescription_requests_user_status_created",
+    ),
+    "all prescription requests": (
+        lambda: get_all_prescription_requests(limit=5),
+        "ix_prescription_requests_created",
+    ),
+    "all prescription requests by status": (
+        lambda: get_all_prescription_requests(status="pending", limit=5),
+        "ix_prescription_requests_status_created",
+    ),
+    "all prescription requests after cursor": (
+        lambda: get_all_prescription_requests(limit=5, after=CURSOR),
+        "ix_prescription_requests_created",
+    ),
+    "count prescription requests by status": (
+        lambda: count_all_prescription_requests(status="pending"),
+        "ix_prescription_requests_status_created",
+    ),
+    "support per user": (
+        lambda: get_support_per_user("u1", limit=2),
+        "ix_support_requests_user_created",
+    ),
+    "support per user by status": (
+        lambda: get_support_per_user("u1", status="pending", limit=2),
+        "ix_support_requests_user_status_created",
+    ),
+    "count support per user": (
+        lambda: count_support_per_user("u1", status="pending"),
+        "ix_support_requests_user_status_created",
+    ),
+    "all support requests": (get_all_support_requests, "ix_support_requests_created"),
+    "stock per store": (lambda: check_stock_per_store("med-1"), "ix_stock_medication"),
+    "active prescription for refill": (
+        lambda: refill_request("refill please", "nobody"),
+        "ix_prescriptions_user_status",
+    ),
+    "medications sold": (get_medications_sold, "ix_medications_sold_sold_at"),
+}
+
+
+def query_plan(c, sql: str) -> list[str]:
+    return [row["detail"] for row in c.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+@pytest.mark.parametrize("name", list(QUERIES))
+def test_query_uses_indexes(seed, name):
+    seed()
+    run, index = QUERIES[name]
+    with track_queries() as tracker:
+        run()
+
+    selects = [sql for sql in tracker.statements if sql.lstrip().upper().startswith("SELECT")]
+    assert selects, f"{name}: no SELECT captured"
+
+    c = conn()
+    try:
+        for sql in selects:
+            plan = query_plan(c, sql)
+            assert any(index in step for step in plan), f"{name} does not use {index}: {plan}"
+            assert not any("TEMP B-TREE" in step for step in plan), f"{name} sorts in a temp b-tree: {plan}"
+            for step in plan:
+                if step.startswith(("SCAN", "SEARCH")):
+                    assert "INDEX" in step, f"{name} reads a table without an index: {plan}"
+    finally:
+        c.close()
@@ -0,0 +1,199 @@
+import functools
+import threading
+import time
+
+import pytest
+
+from agents.agent_utils import conversation_history, session_state, session_store
+from agents.agent_utils.session_redis import RedisSessionStore
+from agents.agent_utils.session_sqlite import SqliteSessionStore
+from agents.agent_utils.session_store import MemorySessionStore
+
+THREADS = 8
+UPDATES = 200
+# Long enough that only explicit flush() calls write in the ordering tests
+NO_BACKGROUND_FLUSH_MS = 60_000
+
+
+class StandInRedis:
+    """The redis-py calls RedisSessionStore makes, backed by a dict."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self.data[key] = value.encode("utf-8")
+            self.expiry[key] = ex
+
+    def delete(self, key):
+        with self._lock:
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _StandInPipeline(self)
+
+
+class _StandInPipeline:
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def set(self, key, value, ex=None):
+        self.commands.append((key, value, ex))
+
+    def execute(self):
+        for key, value, ex in self.commands:
+            self.client.set(key, value, ex=ex)
+        self.commands = []
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = MemorySessionStore()
+    elif request.param == "sqlite":
+        # A short flush interval keeps the flusher racing the writers
+        store = SqliteSessionStore(path=str(tmp_path / "sessions.db"), flush_ms=1)
+    else:
+        store = RedisSessionStore(client=StandInRedis(), flush_ms=1)
+    yield store
+    store.close()
+
+
+def run_threads(target, count=THREADS):
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        target(i)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_concurrent_modify_loses_no_updates(store):
+    def increment(state):
+        time.sleep(0)  # yield mid-update, so unlocked updates would interleave
+        return {**state, "count": state.get("count", 0) + 1}
+
+    run_threads(lambda _: [store.modify("s", increment) for _ in range(UPDATES)])
+
+    assert store.get("s")["count"] == THREADS * UPDATES
+    if hasattr(store, "flush"):
+        store.flush()
+        assert store._load("s")["count"] == THREADS * UPDATES
+
+
+class SlowFlushSqliteStore(SqliteSessionStore):
+    """Holds every batch write until the test releases it."""
+
+    def __init__(self, *args, **kwargs):
+        self.writing = threading.Event()
+        self.release = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def _write_many(self, items):
+        self.writing.set()
+        assert self.release.wait(5)
+        super()._write_many(items)
+
+
+def test_delete_during_slow_flush_stays_deleted(tmp_path):
+    store = SlowFlushSqliteStore(path=str(tmp_path / "sessions.db"), flush_ms=NO_BACKGROUND_FLUSH_MS)
+    try:
+        store.update("s", turn=1)
+        flusher = threading.Thread(target=store.flush)
+        flusher.start()
+        assert store.writing.wait(5)
+
+        # The batch holding turn=1 is mid-write
+        store.delete("s")
+        assert store.get("s") is None
+
+        store.release.set()
+        flusher.join()
+        assert store.get("s") is None
+
+        store.flush()
+        assert store.get("s") is None
+        assert store._load("s") is None
+    finally:
+        store.release.set()
+        store.close()
+
+
+def test_sqlite_stores_on_one_file_see_each_others_writes(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    # No local read cache, so every miss in the buffer goes to the file
+    a = SqliteSessionStore(path=path, local_cache_seconds=0, flush_ms=NO_BACKGROUND_FLUSH_MS)
+    b = SqliteSessionStore(path=path, local_cache_seconds=0, flush_ms=NO_BACKGROUND_FLUSH_MS)
+    try:
+        a.update("s", turn=1)
+        assert b.get("s") is None
+        a.flush()
+        assert b.get("s") == {"turn": 1}
+
+        b.update("s", turn=2)
+        b.flush()
+        assert a.get("s") == {"turn": 2}
+
+        a.delete("s")
+        a.flush()
+        assert b.get("s") is None
+    finally:
+        a.close()
+        b.close()
+
+
+def test_redis_store_round_trips_through_the_client():
+    client = StandInRedis()
+    store = RedisSessionStore(client=client, prefix="test:", ttl_seconds=90, flush_ms=NO_BACKGROUND_FLUSH_MS)
+    other = RedisSessionStore(client=client, prefix="test:", flush_ms=NO_BACKGROUND_FLUSH_MS)
+    try:
+        store.update("s", turn=1, note="שלום")
+        assert store.get("s") == {"turn": 1, "note": "שלום"}
+        assert client.get("test:s") is None
+
+        store.flush()
+        assert client.expiry["test:s"] == 90
+        assert other.get("s") == {"turn": 1, "note": "שלום"}
+
+        store.delete("s")
+        assert store.get("s") is None
+        store.flush()
+        assert client.get("test:s") is None
+    finally:
+        store.close()
+        other.close()
+
+
+def test_concurrent_history_appends_are_not_lost(store, monkeypatch):
+    monkeypatch.setattr(session_store, "_STORE", store)
+    # Room for every turn, so a dropped append shows up in the count
+    monkeypatch.setattr(
+        conversation_history, "append", functools.partial(conversation_history.append, max_turns=THREADS * UPDATES)
+    )
+
+    def turns(i):
+        for j in range(UPDATES // 4):
+            session_state.set_user_message("s", f"{i}-{j}")
+
+    run_threads(turns)
+
+    history = session_state.get_session_state("s")["history"]
+    assert len(history) == THREADS * (UPDATES // 4)
+    for i in range(THREADS):
+        own = [e["content"] for e in history if e["content"].startswith(f"{i}-")]
+        assert own == [f"{i}-{j}" for j in range(UPDATES // 4)]
@@ -0,0 +1,142 @@
+"""
+Thread-safe LRU cache with per-entry TTL and optional byte budget.
+
+Used for the in-memory tiers of the response / rephrase / intent caches
+and the logger registries. Expired entries are dropped lazily on access;
+when the cache is over budget, entries are evicted from the least recently
+used end, one O(1) pop at a time, whether or not they have expired.
+`on_remove(key, value)` is called (under the cache lock) for every entry
+that leaves the cache, so values holding resources can release them.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+def approx_size(value) -> int:
+    """Rough memory footprint of a cached value, in bytes."""
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(approx_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class TTLCache:
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float | None = 3600,
+        max_bytes: int | None = None,
+        sizeof=approx_size,
+        on_remove=None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._on_remove = on_remove
+        # key -> (expires_at, size, value); most recently used last
+        self._data: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, _, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl_seconds: float | None = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self._data[key] = (expires_at, size, value)
+            self._bytes += size
+            self._make_room()
+
+    def delete(self, key) -> None:
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._on_remove is not None:
+                for key, (_, _, value) in self._data.items():
+                    self._on_remove(key, value)
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key) -> None:
+        _, size, value = self._data.pop(key)
+        self._bytes -= size
+        if self._on_remove is not None:
+            self._on_remove(key, value)
+
+    def _over_budget(self) -> bool:
+        if len(self._data) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def _make_room(self) -> None:
+        # Never scan for expired entries here: that is O(n) under the lock on
+        # every insert at capacity. The head is the least recently used entry,
+        # and the likeliest to have expired anyway.
+        now = time.monotonic()
+        while self._over_budget():
+            key = next(iter(self._data))
+            expires_at = self._data[key][0]
+            self._remove(key)
+            if expires_at is not None and expires_at <= now:
+                self.expirations += 1
+            else:
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes if self.max_bytes is not None else None,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
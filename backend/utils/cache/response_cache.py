@@ -0,0 +1,303 @@
+"""
+Two-tier cache for final LLM answers to deterministic workflow contexts.
+
+The same question against the same system_context (the Acamol
+medication_info card, the Glucophage prescription_requirements line)
+gets the same answer, so it is generated once and replayed. Entries are
+keyed on
+
+    (intent, normalized system_context, normalized user prompt,
+     answer language, SYSTEM_PROMPT hash, model, catalog version)
+
+The user prompt is part of the key: "tell me about acamol" and "what are
+the warnings of acamol?" share a context but not an answer.
+
+Tier 1 is a per-process TTL LRU. Tier 2 is a small SQLite file (WAL)
+shared by every worker on the host, with TTL and a byte budget. A new
+catalog version changes the key; rows of versions older than the newest
+one a worker has seen are purged from disk. Rows of newer versions are
+left alone, so workers that are mid-refresh on different versions do not
+delete each other's entries.
+
+Workflows with side effects or live data (stock, refills, support tickets)
+are never cached.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from utils.cache.lru import TTLCache
+from utils.medication.catalog import normalize
+
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "1") != "0"
+RESPONSE_CACHE_PATH = os.environ.get("RESPONSE_CACHE_PATH", "utils/cache/response_cache.db")
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", str(24 * 3600)))
+RESPONSE_CACHE_MEMORY_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MEMORY_ENTRIES", "512"))
+RESPONSE_CACHE_DISK_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_DISK_MAX_MB", "64")) * 1024 * 1024
+
+# Intent names whose answers depend only on the workflow context
+CACHEABLE_INTENTS = frozenset({
+    "GREETING",
+    "MEDICATION_INFO",
+    "MEDICATION_DOSAGE",
+    "ACTIVE_INGREDIENTS",
+    "PRESCRIPTION_REQUIREMENT",
+    "MEDICAL_ADVICE",
+    "SIDE_EFFECTS_CONCERN",
+    "DRUG_INTERACTIONS",
+    "UNKNOWN",
+})
+
+# Error / not-found contexts: the answer echoes what the user asked for
+UNCACHEABLE_CONTEXT_PREFIXES = ("Sorry,", "Medication not found")
+
+# Characters per streamed chunk when replaying a cached answer
+REPLAY_CHUNK_CHARS = 32
+
+# Run disk eviction once every N writes
+_EVICT_EVERY = 50
+
+_WHITESPACE = re.compile(r"\s+")
+
+logger = logging.getLogger(__name__)
+
+
+def _intent_name(intent) -> str:
+    return getattr(intent, "name", str(intent))
+
+
+def is_cacheable(intent, system_context: str) -> bool:
+    if _intent_name(intent) not in CACHEABLE_INTENTS:
+        return False
+    return not (system_context or "").strip().startswith(UNCACHEABLE_CONTEXT_PREFIXES)
+
+
+def make_key(
+    intent,
+    system_context: str,
+    user_prompt: str,
+    lang: str,
+    system_prompt: str,
+    model: str,
+    catalog_version,
+) -> str:
+    context = _WHITESPACE.sub(" ", system_context or "").strip()
+    prompt_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+    raw = json.dumps(
+        [_intent_name(intent), context, normalize(user_prompt), lang, prompt_hash, model, catalog_version],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def iter_chunks(text: str, size: int = REPLAY_CHUNK_CHARS):
+    """Split `text` into roughly `size`-character chunks on word boundaries."""
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + size)
+        if end < len(text):
+            space = text.rfind(" ", start, end)
+            if space > start:
+                end = space + 1
+        yield text[start:end]
+        start = end
+
+
+class ResponseCache:
+
+    def __init__(
+        self,
+        path: str = RESPONSE_CACHE_PATH,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        memory_entries: int = RESPONSE_CACHE_MEMORY_ENTRIES,
+        disk_max_bytes: int = RESPONSE_CACHE_DISK_MAX_BYTES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.disk_max_bytes = disk_max_bytes
+        self.memory = TTLCache(max_entries=memory_entries, ttl_seconds=ttl_seconds)
+
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._catalog_version = None
+        self._writes = 0
+
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_writes = 0
+        self.disk_evictions = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    # ---- Disk tier ----
+
+    def _disk(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            c = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            c.execute("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+              key TEXT PRIMARY KEY,
+              response TEXT NOT NULL,
+              catalog_version TEXT,
+              created_at REAL NOT NULL,
+              accessed_at REAL NOT NULL,
+              bytes INTEGER NOT NULL
+            )""")
+            c.execute("CREATE INDEX IF NOT EXISTS ix_response_cache_accessed ON response_cache(accessed_at)")
+            self._conn = c
+        return self._conn
+
+    def _evict_disk(self, c: sqlite3.Connection) -> None:
+        now = time.time()
+        expired = c.execute(
+            "DELETE FROM response_cache WHERE created_at <= ?", (now - self.ttl_seconds,)
+        ).rowcount
+
+        total = c.execute("SELECT COALESCE(SUM(bytes), 0) FROM response_cache").fetchone()[0]
+        evicted = 0
+        while total > self.disk_max_bytes:
+            rows = c.execute(
+                "SELECT key, bytes FROM response_cache ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            c.executemany("DELETE FROM response_cache WHERE key = ?", [(k,) for k, _ in rows])
+            total -= sum(b for _, b in rows)
+            evicted += len(rows)
+
+        self.disk_evictions += expired + evicted
+
+    # ---- Invalidation ----
+
+    def observe_catalog_version(self, version) -> None:
+        """
+        Clear the memory tier the first time a new catalog version is seen,
+        and drop disk rows of older versions (never newer ones).
+        """
+        if version == self._catalog_version:
+            return
+        with self._lock:
+            if version == self._catalog_version:
+                return
+            first = self._catalog_version is None
+            self._catalog_version = version
+            self.memory.clear()
+            try:
+                # Versions are the catalog_version counter; anything else only
+                # relies on the key keeping versions apart
+                numeric = int(version)
+            except (TypeError, ValueError):
+                numeric = None
+            if numeric is not None:
+                try:
+                    self._disk().execute(
+                        "DELETE FROM response_cache WHERE CAST(catalog_version AS INTEGER) < ?",
+                        (numeric,),
+                    )
+                except sqlite3.Error:
+                    self.errors += 1
+                    logger.exception("Response cache purge failed")
+            if not first:
+                self.invalidations += 1
+                logger.info("Response cache invalidated for catalog version %s", version)
+
+    # ---- Lookups ----
+
+    def get(self, key: str) -> str | None:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        try:
+            with self._lock:
+                c = self._disk()
+                row = c.execute(
+                    "SELECT response, created_at FROM response_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > time.time() - self.ttl_seconds:
+                    c.execute("UPDATE response_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                else:
+                    row = None
+        except sqlite3.Error:
+            self.errors += 1
+            logger.exception("Response cache read failed")
+            return None
+
+        if row is None:
+            self.disk_misses += 1
+            return None
+
+        self.disk_hits += 1
+        self.memory.set(key, row[0])
+        return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        self.memory.set(key, response)
+
+        now = time.time()
+        version = self._catalog_version
+        try:
+            with self._lock:
+                c = self._disk()
+                c.execute(
+                    "INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        response,
+                        None if version is None else str(version),
+                        now,
+                        now,
+                        len(response.encode("utf-8")),
+                    ),
+                )
+                self.disk_writes += 1
+                self._writes += 1
+                if self._writes % _EVICT_EVERY == 0:
+                    self._evict_disk(c)
+        except sqlite3.Error:
+            self.errors += 1
+            logger.exception("Response cache write failed")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": RESPONSE_CACHE_ENABLED,
+            "memory": self.memory.stats(),
+            "disk_hits": self.disk_hits,
+            "disk_misses": self.disk_misses,
+            "disk_writes": self.disk_writes,
+            "disk_evictions": self.disk_evictions,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "catalog_version": self._catalog_version,
+        }
+
+
+_RESPONSE_CACHE: ResponseCache | None = None
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _RESPONSE_CACHE
+    if _RESPONSE_CACHE is None:
+        with _RESPONSE_CACHE_LOCK:
+            if _RESPONSE_CACHE is None:
+                _RESPONSE_CACHE = ResponseCache()
+    return _RESPONSE_CACHE
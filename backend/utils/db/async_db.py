@@ -0,0 +1,55 @@
+"""
+Async access to the SQLite layer for FastAPI `async def` endpoints.
+
+sqlite3 is blocking, so calls are shipped to a dedicated thread pool sized
+to the connection pool. Each call runs inside one pooled checkout, which
+means a workflow issuing several queries holds a single connection and the
+event loop stays free to keep streaming to other clients meanwhile.
+"""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.db.db import POOL_SIZE, connection
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=POOL_SIZE,
+                    thread_name_prefix="db",
+                )
+    return _EXECUTOR
+
+
+async def run_db(fn, *args, **kwargs):
+    """
+    Run a blocking, database-bound callable without blocking the event loop.
+
+    The caller's context (request id, loggers, ...) is propagated to the
+    worker thread and the whole call shares one pooled connection.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+
+    def _call():
+        with connection():
+            return fn(*args, **kwargs)
+
+    return await loop.run_in_executor(get_db_executor(), ctx.run, _call)
+
+
+def shutdown_db_executor():
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown(wait=True)
+            _EXECUTOR = None
@@ -1,18 +1,239 @@
+import logging
+import os
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 DB_PATH = "utils/db/pharmacy.db"
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "8"))
+POOL_TIMEOUT_SECONDS = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
 
+logger = logging.getLogger(__name__)
 
-def conn():
+# Connection checked out by the current request/task, so nested helpers reuse it
+_CURRENT_CONN: ContextVar[sqlite3.Connection | None] = ContextVar("db_current_conn", default=None)
+# Active `track_queries()` recorder for the current context, if any
+_QUERY_TRACKER: ContextVar["QueryTracker | None"] = ContextVar("db_query_tracker", default=None)
+
+
+class PoolTimeout(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class QueryTracker:
+    """Statements executed on pooled connections inside `track_queries()`."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def track_queries():
+    """
+    Record every statement run through the pool in the current context:
+
+        with track_queries() as tracker:
+            load_dashboard_data()
+        assert tracker.count == 3
+    """
+    tracker = QueryTracker()
+    token = _QUERY_TRACKER.set(tracker)
     try:
-        c = sqlite3.connect(DB_PATH, check_same_thread=False)
+        yield tracker
+    finally:
+        _QUERY_TRACKER.reset(token)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections.
+
+    Connections are opened lazily up to `size` and handed out through
+    `connection()`. The checkout is re-entrant per context: nested calls made
+    while a connection is already checked out (same request / task) reuse it
+    instead of taking another one from the pool.
+    """
+
+    def __init__(self, path: str, size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT_SECONDS):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+
+        # ---- Stats ----
+        self._total_opened = 0
+        self._queries = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _open(self) -> sqlite3.Connection:
+        c = sqlite3.connect(self.path, check_same_thread=False)
         c.row_factory = sqlite3.Row
-        print("Connection Successful:", DB_PATH)
+        c.set_trace_callback(self._on_statement)
+        return c
+
+    def _on_statement(self, sql: str):
+        with self._lock:
+            self._queries += 1
+        tracker = _QUERY_TRACKER.get()
+        if tracker is not None:
+            tracker.statements.append(sql)
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                open_new = True
+            else:
+                open_new = False
+
+        if open_new:
+            try:
+                c = self._open()
+            except sqlite3.Error:
+                with self._lock:
+                    self._opened -= 1
+                logger.exception("[DB ERROR] Failed to connect to %s", self.path)
+                raise
+            with self._lock:
+                self._total_opened += 1
+            return c
+
+        # Pool exhausted - wait for a connection to be returned
+        started = time.perf_counter()
+        try:
+            c = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolTimeout(
+                f"Timed out after {self.timeout}s waiting for a database connection"
+            ) from None
+        waited = time.perf_counter() - started
+
+        with self._lock:
+            self._waits += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
         return c
 
-    except sqlite3.Error as e:
-        print(f"[DB ERROR] Failed to connect to {DB_PATH}: {e}")
-        return {f"[DB ERROR] Failed to connect to {DB_PATH}: {e}"}
+    def _release(self, c: sqlite3.Connection):
+        try:
+            # Never hand out a connection with a dangling transaction
+            if c.in_transaction:
+                c.rollback()
+        except sqlite3.Error:
+            logger.exception("Discarding broken pooled connection")
+            with self._lock:
+                self._opened -= 1
+            try:
+                c.close()
+            except sqlite3.Error:
+                pass
+            return
+        self._idle.put(c)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of the `with` block."""
+        current = _CURRENT_CONN.get()
+        if current is not None:
+            yield current
+            return
+
+        c = self._acquire()
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+        token = _CURRENT_CONN.set(c)
+        try:
+            yield c
+        finally:
+            _CURRENT_CONN.reset(token)
+            with self._lock:
+                self._in_use -= 1
+            self._release(c)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._opened,
+                "idle": self._idle.qsize(),
+                "in_use": self._in_use,
+                "total_opened": self._total_opened,
+                "checkouts": self._checkouts,
+                "queries": self._queries,
+                "waits": self._waits,
+                "total_wait_ms": round(self._total_wait * 1000, 3),
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+            }
+
+    def close_all(self):
+        """Close idle connections (used on shutdown)."""
+        while True:
+            try:
+                c = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            c.close()
+            with self._lock:
+                self._opened -= 1
+
+
+_POOL: ConnectionPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ConnectionPool(DB_PATH)
+    return _POOL
+
+
+def connection():
+    """
+    Request-scoped pooled connection:
+
+        with connection() as c:
+            c.execute(...)
+
+    Do not close the returned connection - it goes back to the pool.
+    """
+    return get_pool().connection()
+
+
+def pool_stats() -> dict:
+    return get_pool().stats()
+
+
+def conn():
+    """
+    Open a standalone (non-pooled) connection.
+    Only meant for scripts such as seed.py; request handlers use `connection()`.
+    """
+    c = sqlite3.connect(DB_PATH, check_same_thread=False)
+    c.row_factory = sqlite3.Row
+    return c
 
 def init_schema():
     c = conn()
@@ -99,4 +320,138 @@ def init_schema():
     """)
 
     c.commit()
+    migrate(c)
     c.close()
+
+
+# ============================================================================
+# Migrations
+# ============================================================================
+
+# (version, name, statements) - append only, never edit an applied migration
+MIGRATIONS = [
+    (
+        1,
+        "indexes for list endpoints, stock and sales lookups",
+        [
+            # Per-user listing, ordered by created_at (covers the prescription list columns)
+            "CREATE INDEX IF NOT EXISTS ix_prescription_requests_user_created "
+            "ON prescription_requests (user_id, created_at, id, status, request_type)",
+            "CREATE INDEX IF NOT EXISTS ix_prescription_requests_user_status_created "
+            "ON prescription_requests (user_id, status, created_at, id, request_type)",
+            # Pharmacist listing across all users
+            "CREATE INDEX IF NOT EXISTS ix_prescription_requests_created "
+            "ON prescription_requests (created_at, id)",
+            "CREATE INDEX IF NOT EXISTS ix_prescription_requests_status_created "
+            "ON prescription_requests (status, created_at, id)",
+
+            "CREATE INDEX IF NOT EXISTS ix_support_requests_user_created "
+            "ON support_requests (user_id, created_at, id)",
+            "CREATE INDEX IF NOT EXISTS ix_support_requests_user_status_created "
+            "ON support_requests (user_id, status, created_at, id)",
+            "CREATE INDEX IF NOT EXISTS ix_support_requests_created "
+            "ON support_requests (created_at, id)",
+            "CREATE INDEX IF NOT EXISTS ix_support_requests_status_created "
+            "ON support_requests (status, created_at, id)",
+
+            # Stock per medication across stores (PK is store-first)
+            "CREATE INDEX IF NOT EXISTS ix_stock_medication "
+            "ON stock (medication_id, store_id, quantity)",
+
+            # Active prescription lookup in the refill workflow
+            "CREATE INDEX IF NOT EXISTS ix_prescriptions_user_status "
+            "ON prescriptions (user_id, status)",
+
+            "CREATE INDEX IF NOT EXISTS ix_medications_sold_sold_at "
+            "ON medications_sold (sold_at)",
+            "CREATE INDEX IF NOT EXISTS ix_medications_sold_medication "
+            "ON medications_sold (medication_id, sold_at)",
+        ],
+    ),
+    (
+        2,
+        "catalog version bumped on every medications change",
+        [
+            "CREATE TABLE IF NOT EXISTS catalog_version ("
+            "  id INTEGER PRIMARY KEY CHECK (id = 1),"
+            "  version INTEGER NOT NULL"
+            ")",
+            "INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)",
+            "CREATE TRIGGER IF NOT EXISTS trg_medications_insert AFTER INSERT ON medications "
+            "BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END",
+            "CREATE TRIGGER IF NOT EXISTS trg_medications_update AFTER UPDATE ON medications "
+            "BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END",
+            "CREATE TRIGGER IF NOT EXISTS trg_medications_delete AFTER DELETE ON medications "
+            "BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END",
+        ],
+    ),
+    (
+        3,
+        "medication aliases (Hebrew / English names, misspellings)",
+        [
+            "CREATE TABLE IF NOT EXISTS medication_aliases ("
+            "  alias TEXT NOT NULL,"
+            "  medication_id TEXT NOT NULL,"
+            "  lang TEXT,"           # 'he' / 'en'
+            "  kind TEXT,"           # 'brand' / 'generic' / 'misspelling'
+            "  PRIMARY KEY (alias, medication_id)"
+            ")",
+            "CREATE INDEX IF NOT EXISTS ix_medication_aliases_medication "
+            "ON medication_aliases (medication_id)",
+            "CREATE TRIGGER IF NOT EXISTS trg_medication_aliases_insert AFTER INSERT ON medication_aliases "
+            "BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END",
+            "CREATE TRIGGER IF NOT EXISTS trg_medication_aliases_update AFTER UPDATE ON medication_aliases "
+            "BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END",
+            "CREATE TRIGGER IF NOT EXISTS trg_medication_aliases_delete AFTER DELETE ON medication_aliases "
+            "BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END",
+        ],
+    ),
+]
+
+
+def schema_version(c) -> int:
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+      version INTEGER PRIMARY KEY,
+      name TEXT,
+      applied_at TEXT
+    )""")
+    row = c.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()
+    return row[0]
+
+
+def migrate(c) -> int:
+    """
+    Apply pending migrations in order, one transaction per migration.
+    Safe to run from several workers at once: the version is re-checked
+    under a write lock before each migration is applied.
+    """
+    current = schema_version(c)
+
+    for version, name, statements in MIGRATIONS:
+        if version <= current:
+            continue
+
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(c) >= version:
+                c.rollback()
+                continue
+            for sql in statements:
+                c.execute(sql)
+            c.execute(
+                "INSERT INTO schema_version (version, name, applied_at) "
+                "VALUES (?, ?, datetime('now'))",
+                (version, name),
+            )
+            c.commit()
+        except Exception:
+            c.rollback()
+            logger.exception("Migration %s (%s) failed", version, name)
+            raise
+
+        logger.info("Applied migration %s: %s", version, name)
+        current = version
+
+    c.execute("PRAGMA optimize")
+    return current
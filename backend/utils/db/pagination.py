@@ -0,0 +1,67 @@
+"""
+Keyset pagination helpers for lists ordered by (created_at, id) DESC.
+
+The cursor handed to clients is opaque (urlsafe base64 of JSON) so the
+sort key can change later without breaking them.
+"""
+
+import base64
+import json
+
+
+def encode_cursor(created_at: str, row_id: str) -> str:
+    raw = json.dumps([created_at, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor from `encode_cursor`. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor") from None
+
+    if not isinstance(created_at, str) or not isinstance(row_id, str):
+        raise ValueError("Invalid cursor")
+    return created_at, row_id
+
+
+def next_cursor(rows: list[dict], limit: int) -> str | None:
+    """Cursor for the page after `rows`, or None when this was the last page."""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last["created_at"], last["id"])
+
+
+def build_page_query(
+    where: list[str],
+    params: list,
+    after: tuple[str, str] | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+    prefix: str = "",
+) -> tuple[str, list]:
+    """
+    Build the WHERE / ORDER BY / LIMIT tail of a newest-first list query.
+
+    `after` is a decoded cursor - only rows strictly older than it are
+    returned. `offset` is applied after the cursor. `prefix` qualifies
+    the sort columns when the query joins other tables (e.g. "pr.").
+    """
+    where = list(where)
+    params = list(params)
+
+    if after is not None:
+        where.append(f"({prefix}created_at, {prefix}id) < (?, ?)")
+        params.extend(after)
+
+    sql = f" WHERE {' AND '.join(where)}" if where else ""
+    sql += f" ORDER BY {prefix}created_at DESC, {prefix}id DESC"
+
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+    return sql, params
@@ -101,6 +101,46 @@ def seed():
         meds
     )
 
+    aliases = [
+        # (alias, medication_id, lang, kind)
+        ("אקמול", "m1", "he", "brand"),
+        ("פרצטמול", "m1", "he", "generic"),
+        ("פאראצטמול", "m1", "he", "generic"),
+        ("akamol", "m1", "en", "misspelling"),
+        ("acamoll", "m1", "en", "misspelling"),
+        ("acetaminophen", "m1", "en", "generic"),
+
+        ("נורופן", "m2", "he", "brand"),
+        ("איבופרופן", "m2", "he", "generic"),
+        ("neurofen", "m2", "en", "misspelling"),
+        ("nurofn", "m2", "en", "misspelling"),
+        ("ibuprofin", "m2", "en", "misspelling"),
+
+        ("אוגמנטין", "m3", "he", "brand"),
+        ("אמוקסיצילין", "m3", "he", "generic"),
+        ("augmentine", "m3", "en", "misspelling"),
+
+        ("ונטולין", "m4", "he", "brand"),
+        ("סלבוטמול", "m4", "he", "generic"),
+        ("ventoline", "m4", "en", "misspelling"),
+        ("albuterol", "m4", "en", "generic"),
+
+        ("קלריטין", "m5", "he", "brand"),
+        ("לורטדין", "m5", "he", "generic"),
+        ("claritine", "m5", "en", "misspelling"),
+        ("claratin", "m5", "en", "misspelling"),
+
+        ("גלוקופאג'", "m6", "he", "brand"),
+        ("גלוקופג'", "m6", "he", "brand"),
+        ("מטפורמין", "m6", "he", "generic"),
+        ("glucofage", "m6", "en", "misspelling"),
+    ]
+
+    cur.executemany(
+        "INSERT OR REPLACE INTO medication_aliases (alias, medication_id, lang, kind) VALUES (?,?,?,?)",
+        aliases
+    )
+
     stock_rows = [
       ("store_tlv","m1",42),("store_tlv","m2",15),("store_tlv","m3",5),("store_tlv","m4",0),("store_tlv","m5",18),
       ("store_jlm","m1",10),("store_jlm","m2",0),("store_jlm","m3",2),("store_jlm","m4",7),("store_jlm","m5",4),
@@ -0,0 +1,204 @@
+"""
+Background writer that takes file I/O for logging off the request path.
+
+Session and workflow loggers write through a QueuedHandler in front of
+the file handler. `emit` only renders the message and puts the record on a bounded
+in-memory queue. A single writer thread drains the queue in batches, writes
+every record of a batch to its file, and flushes each file once per batch
+rather than once per line.
+
+When the queue is full, LOG_QUEUE_POLICY decides:
+  drop   the record is discarded and counted (default; requests never wait)
+  block  the caller waits for room (nothing lost; requests slow down)
+
+LOG_ASYNC=0 keeps the old synchronous handlers.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+from utils.metrics.registry import METRICS
+
+LOG_ASYNC = os.environ.get("LOG_ASYNC", "1") != "0"
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+LOG_QUEUE_POLICY = os.environ.get("LOG_QUEUE_POLICY", "drop")
+LOG_BATCH = int(os.environ.get("LOG_BATCH", "512"))
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+def _write(handler: logging.Handler, record: logging.LogRecord) -> None:
+    """StreamHandler.emit without the per-record flush."""
+    if isinstance(handler, logging.handlers.BaseRotatingHandler) and handler.shouldRollover(record):
+        handler.doRollover()
+    if isinstance(handler, logging.FileHandler) and handler.stream is None:
+        handler.stream = handler._open()
+    handler.stream.write(handler.format(record) + handler.terminator)
+
+
+class LogWriter:
+
+    def __init__(self, max_queue: int = LOG_QUEUE_SIZE, policy: str = LOG_QUEUE_POLICY, batch: int = LOG_BATCH):
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown LOG_QUEUE_POLICY {policy!r}; expected drop or block")
+        self.policy = policy
+        self.batch = batch
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                    self._thread.start()
+
+    def submit(self, handler: logging.Handler, record: logging.LogRecord) -> None:
+        self._ensure_started()
+        if self.policy == "block":
+            self._queue.put((handler, record))
+        else:
+            try:
+                self._queue.put_nowait((handler, record))
+            except queue.Full:
+                self.dropped += 1
+                METRICS.counter("logging.dropped").inc()
+                return
+        self.enqueued += 1
+
+    def submit_close(self, handler: logging.Handler) -> None:
+        """Close `handler` once the records queued before this call are written."""
+        if self._thread is None:
+            handler.close()
+            return
+        # Never dropped: an unclosed handler would leak its descriptor
+        self._queue.put((handler, None))
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while len(items) < self.batch:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not self._write_batch(items):
+                return
+
+    def _write_batch(self, items: list) -> bool:
+        touched = {}
+        running = True
+        for item in items:
+            if item is _STOP:
+                running = False
+                continue
+            handler, record = item
+            if record is None:
+                self._flush(handler)
+                touched.pop(id(handler), None)
+                handler.close()
+                continue
+            try:
+                with handler.lock:
+                    _write(handler, record)
+                touched[id(handler)] = handler
+                self.written += 1
+            except Exception:
+                self.errors += 1
+                handler.handleError(record)
+
+        for handler in touched.values():
+            self._flush(handler)
+        self.batches += 1
+        return running
+
+    def _flush(self, handler: logging.Handler) -> None:
+        try:
+            handler.flush()
+        except Exception:
+            self.errors += 1
+            logger.exception("Flushing log handler failed")
+
+    def stop(self, timeout: float = 5) -> None:
+        """Write everything queued so far, then stop the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "errors": self.errors,
+        }
+
+
+class QueuedHandler(logging.Handler):
+    """Hands records for `target` to the background writer."""
+
+    def __init__(self, target: logging.Handler, writer: LogWriter):
+        super().__init__(target.level)
+        self.target = target
+        self.writer = writer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            # Render now: the arguments may change before the writer gets to them
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+            self.writer.submit(self.target, record)
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        self.writer.submit_close(self.target)
+        super().close()
+
+
+_LOG_WRITER: LogWriter | None = None
+_LOG_WRITER_LOCK = threading.Lock()
+
+
+def get_log_writer() -> LogWriter:
+    global _LOG_WRITER
+    if _LOG_WRITER is None:
+        with _LOG_WRITER_LOCK:
+            if _LOG_WRITER is None:
+                _LOG_WRITER = LogWriter()
+                atexit.register(_LOG_WRITER.stop)
+    return _LOG_WRITER
+
+
+def stop_log_writer() -> None:
+    if _LOG_WRITER is not None:
+        _LOG_WRITER.stop()
+
+
+def log_writer_stats() -> dict:
+    if _LOG_WRITER is None:
+        return {"enabled": LOG_ASYNC}
+    return {"enabled": LOG_ASYNC, **_LOG_WRITER.stats()}
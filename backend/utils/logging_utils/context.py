@@ -0,0 +1,30 @@
+"""
+Per-request logging context.
+
+The request id is set once per HTTP request by the middleware in app.py and
+read by the log sink for every record. Context variables follow the
+request into asyncio.to_thread and run_db worker threads.
+"""
+
+import uuid
+from contextvars import ContextVar
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Longest client-supplied request id that is kept as-is
+MAX_REQUEST_ID_LENGTH = 64
+
+REQUEST_ID: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def new_request_id(supplied: str | None = None) -> str:
+    """Use the caller's id when it is sane, otherwise generate one."""
+    if supplied:
+        supplied = supplied.strip()
+        if 0 < len(supplied) <= MAX_REQUEST_ID_LENGTH and supplied.isprintable():
+            return supplied
+    return uuid.uuid4().hex
+
+
+def current_request_id() -> str | None:
+    return REQUEST_ID.get()
@@ -0,0 +1,264 @@
+"""
+Single structured log sink for the session and workflow loggers.
+
+Every record becomes one JSON line in the process's own file,
+LOG_DIR/<LOG_SINK_FILE stem>-<pid>.jsonl:
+
+    {"ts": "...", "level": "INFO", "kind": "session", "logger": "...",
+     "request_id": "...", "session_id": "...", "user_id": "...", "message": "..."}
+
+so the day's logs are searched by field instead of walking a directory
+per user and session. Each worker process (uvicorn --workers N) owns its
+file, so no two processes ever rotate the same one. The file rotates at
+local midnight into <file>.<YYYY-MM-DD>.gz; an existing archive is never
+overwritten. Archives older than LOG_RETENTION_DAYS are deleted.
+
+Rollover itself is only a rename. Gzip and retention run on a separate
+compressor thread, so they never hold up the log writer's queue. On
+startup, segments left uncompressed by earlier processes (and the live
+files of processes that are gone) are compressed as well.
+"""
+
+import gzip
+import json
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+from datetime import datetime, timedelta
+from logging.handlers import TimedRotatingFileHandler
+
+from utils.logging_utils.async_writer import LOG_ASYNC, QueuedHandler, get_log_writer
+from utils.logging_utils.context import current_request_id
+
+LOG_DIR = os.environ.get("LOG_DIR", "logging")
+LOG_SINK_FILE = os.environ.get("LOG_SINK_FILE", "pharmacy.jsonl")
+LOG_RETENTION_DAYS = int(os.environ.get("LOG_RETENTION_DAYS", "14"))
+
+# "<stem>-<pid>.jsonl.2026-10-17.gz" and friends
+_SEGMENT_DATE = re.compile(r"\.(\d{4}-\d{2}-\d{2})(?:\.\d+)?(?:\.gz)?$")
+_LIVE_PID = re.compile(r"^(\d+)\.[^.]+$")
+
+logger = logging.getLogger(__name__)
+
+
+class ContextFilter(logging.Filter):
+    """Stamps records with the logger's fixed ids and the current request id."""
+
+    def __init__(self, kind: str, user_id: str, session_id: str | None = None):
+        super().__init__()
+        self.kind = kind
+        self.user_id = user_id
+        self.session_id = session_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.kind = self.kind
+        record.user_id = self.user_id
+        record.session_id = self.session_id
+        record.request_id = current_request_id()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "kind": getattr(record, "kind", None),
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", None),
+            "session_id": getattr(record, "session_id", None),
+            "user_id": getattr(record, "user_id", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def process_log_path(directory: str, filename: str, pid: int | None = None) -> str:
+    """`pharmacy.jsonl` -> `<directory>/pharmacy-<pid>.jsonl`: one live file per process."""
+    stem, ext = os.path.splitext(filename)
+    return os.path.join(directory, f"{stem}-{os.getpid() if pid is None else pid}{ext}")
+
+
+def _unique(path: str) -> str:
+    """`path`, or `path` with a counter before .gz if that name is taken."""
+    root = path[:-3] if path.endswith(".gz") else path
+    candidate, n = path, 0
+    # The plain name is taken too while a segment waits for compression
+    while os.path.exists(candidate) or os.path.exists(candidate[:-3]):
+        n += 1
+        candidate = f"{root}.{n}.gz"
+    return candidate
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SegmentCompressor:
+    """
+    Gzips closed log segments and applies retention on its own thread, so
+    neither the log writer nor a request waits for compression.
+    """
+
+    def __init__(self, directory: str, filename: str, retention_days: int = LOG_RETENTION_DAYS):
+        self.directory = directory
+        self.stem = os.path.splitext(filename)[0]
+        self.retention_days = retention_days
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.compressed = 0
+        self.errors = 0
+
+    def submit(self, source: str, dest: str) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-compressor", daemon=True)
+                self._thread.start()
+        self._queue.put((source, dest))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            self.compress(*item)
+            self.apply_retention()
+
+    def compress(self, source: str, dest: str) -> None:
+        # Claim the segment first: another worker's startup sweep may race us
+        claimed = f"{source}.{os.getpid()}.part"
+        try:
+            os.rename(source, claimed)
+        except FileNotFoundError:
+            return
+        except OSError:
+            self.errors += 1
+            logger.exception("Claiming log segment %s failed", source)
+            return
+        try:
+            dest = _unique(dest)
+            with open(claimed, "rb") as src, gzip.open(dest + ".tmp", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(dest + ".tmp", dest)
+            os.remove(claimed)
+            self.compressed += 1
+        except OSError:
+            self.errors += 1
+            logger.exception("Compressing log segment %s failed", source)
+
+    def _is_ours(self, name: str) -> bool:
+        return name.startswith(self.stem + "-")
+
+    def apply_retention(self) -> None:
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        for name in os.listdir(self.directory):
+            match = _SEGMENT_DATE.search(name)
+            if not self._is_ours(name) or not name.endswith(".gz") or not match:
+                continue
+            if match.group(1) < cutoff:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    logger.exception("Removing old log segment %s failed", name)
+
+    def sweep(self) -> None:
+        """
+        Compress what earlier processes left behind: rotated segments that
+        were never gzipped, and the live files of processes that are gone.
+        """
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not self._is_ours(name) or name.endswith((".gz", ".tmp", ".part")):
+                continue
+            if _SEGMENT_DATE.search(name):
+                self.submit(path, path + ".gz")
+                continue
+            match = _LIVE_PID.match(name[len(self.stem) + 1:])
+            if match and not _pid_alive(int(match.group(1))):
+                day = datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d")
+                self.submit(path, f"{path}.{day}.gz")
+
+    def stop(self, timeout: float = 30) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+
+class DailyJsonHandler(TimedRotatingFileHandler):
+    """
+    Midnight rotation of one process's file. Rollover only renames the file
+    (cheap); the compressor gzips it afterwards. Rotated names are made
+    unique instead of overwriting an existing archive.
+    """
+
+    def __init__(self, path: str, compressor: SegmentCompressor):
+        # Retention is applied by the compressor, not by the base class
+        super().__init__(path, when="midnight", backupCount=0, encoding="utf-8", delay=True)
+        self.compressor = compressor
+        self.namer = lambda name: _unique(name + ".gz")
+        self.rotator = self._rotate
+        self.setFormatter(JsonFormatter())
+
+    def _rotate(self, source: str, dest: str) -> None:
+        if not os.path.exists(source):
+            return
+        plain = dest[:-3]
+        os.rename(source, plain)
+        self.compressor.submit(plain, dest)
+
+
+_LOG_SINK: logging.Handler | None = None
+_COMPRESSOR: SegmentCompressor | None = None
+_LOG_SINK_LOCK = threading.Lock()
+
+
+def get_log_sink() -> logging.Handler:
+    """
+    The handler every session / workflow logger attaches. It is marked
+    `shared`, so the logger registries never close it on eviction.
+    """
+    global _LOG_SINK
+    if _LOG_SINK is None:
+        with _LOG_SINK_LOCK:
+            if _LOG_SINK is None:
+                global _COMPRESSOR
+                os.makedirs(LOG_DIR, exist_ok=True)
+                _COMPRESSOR = SegmentCompressor(LOG_DIR, LOG_SINK_FILE)
+                _COMPRESSOR.sweep()
+                handler = DailyJsonHandler(process_log_path(LOG_DIR, LOG_SINK_FILE), _COMPRESSOR)
+                handler.setLevel(logging.INFO)
+                if LOG_ASYNC:
+                    handler = QueuedHandler(handler, get_log_writer())
+                handler.shared = True
+                _LOG_SINK = handler
+    return _LOG_SINK
+
+
+def close_log_sink() -> None:
+    """Close the sink file; call after the log writer has drained."""
+    global _LOG_SINK
+    with _LOG_SINK_LOCK:
+        sink, _LOG_SINK = _LOG_SINK, None
+    if sink is None:
+        return
+    target = getattr(sink, "target", sink)
+    target.close()
+    if _COMPRESSOR is not None:
+        _COMPRESSOR.stop()
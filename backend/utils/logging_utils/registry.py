@@ -0,0 +1,107 @@
+"""
+LRU-bounded registry of per-user / per-session loggers.
+
+An unbounded cache of one logger per session grows without limit under
+real traffic - and runs the process out of descriptors when each logger
+owns a file handler. The registry keeps at most `max_entries` loggers,
+drops those idle for `idle_seconds`, and closes and detaches the handlers
+of every logger it lets go. Handlers marked `shared` (the JSON log sink)
+are left attached, never closed or re-wrapped: they own no per-logger
+resources, and a request still holding an evicted logger keeps writing
+through them.
+
+Loggers are built directly rather than through logging.getLogger, so they
+are never added to the logging manager's global dict (which is never
+pruned) and are garbage collected once evicted and no longer referenced.
+"""
+
+import logging
+import os
+import threading
+
+from utils.cache.lru import TTLCache
+from utils.logging_utils.async_writer import LOG_ASYNC, QueuedHandler, get_log_writer
+
+
+def open_fd_count() -> int | None:
+    """Open file descriptors of this process (None where /proc is unavailable)."""
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def close_logger(logger: logging.Logger) -> None:
+    for handler in list(logger.handlers):
+        if getattr(handler, "shared", False):
+            continue
+        logger.removeHandler(handler)
+        try:
+            handler.close()
+        except Exception:
+            logging.getLogger(__name__).exception("Closing handler of %s failed", logger.name)
+
+
+class LoggerRegistry:
+
+    def __init__(
+        self,
+        factory,
+        max_entries: int,
+        idle_seconds: float | None,
+        queued: bool = LOG_ASYNC,
+        writer=None,
+    ):
+        """
+        `factory(key, logger)` attaches the handlers of a newly created logger.
+        With `queued`, each handler is moved behind `writer` (the process-wide
+        background log writer by default).
+        """
+        self._factory = factory
+        self._queued = queued
+        self._writer = writer
+        self._loggers = TTLCache(
+            max_entries=max_entries,
+            ttl_seconds=idle_seconds,
+            on_remove=self._on_remove,
+        )
+        self._lock = threading.Lock()
+        self.created = 0
+        self.closed = 0
+
+    def _on_remove(self, key, logger: logging.Logger) -> None:
+        close_logger(logger)
+        self.closed += 1
+
+    def get(self, key, name: str) -> logging.Logger:
+        logger = self._loggers.get(key)
+        if logger is not None:
+            return logger
+
+        with self._lock:
+            # Another thread may have created it while we waited
+            logger = self._loggers.get(key)
+            if logger is None:
+                logger = logging.Logger(name, logging.INFO)
+                logger.propagate = False
+                self._factory(key, logger)
+                if self._queued:
+                    writer = self._writer or get_log_writer()
+                    for handler in list(logger.handlers):
+                        if getattr(handler, "shared", False):
+                            continue
+                        logger.removeHandler(handler)
+                        logger.addHandler(QueuedHandler(handler, writer))
+                self._loggers.set(key, logger)
+                self.created += 1
+        return logger
+
+    def clear(self) -> None:
+        self._loggers.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self._loggers.stats(),
+            "created": self.created,
+            "closed": self.closed,
+        }
@@ -0,0 +1,76 @@
+"""
+Aho-Corasick multi-pattern matcher.
+
+All medication names and aliases are compiled into one automaton so every
+mention in a message is found in a single left-to-right pass, in time
+linear in the message length plus the number of matches.
+"""
+
+from collections import deque
+
+
+class AhoCorasick:
+
+    def __init__(self):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # node -> [(pattern length, value), ...] ending at that node
+        self._out: list[list[tuple[int, object]]] = [[]]
+        self._built = False
+
+    def add(self, pattern: str, value) -> None:
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+
+        if not any(v is value for _, v in self._out[node]):
+            self._out[node].append((len(pattern), value))
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links (breadth-first); call after the last `add`."""
+        goto, fail, out = self._goto, self._fail, self._out
+
+        queue = deque()
+        for child in goto[0].values():
+            fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                # Patterns that are suffixes of this one also end here
+                out[child] = out[child] + out[fail[child]]
+
+        self._built = True
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, value) for every pattern occurrence in `text`."""
+        if not self._built:
+            self.build()
+
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in out[node]:
+                yield i - length + 1, i + 1, value
+
+    def __len__(self) -> int:
+        return len(self._goto)
@@ -0,0 +1,388 @@
+"""
+In-process medication catalog.
+
+The medications table is small and read on almost every chat turn, so it is
+loaded once and indexed in memory. Lookups never touch the database; a
+background thread polls `catalog_version` (bumped by triggers on every
+medications / medication_aliases change) and swaps in a fresh index when it
+moves.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+
+from utils.db.db import connection
+from utils.medication.alias_matcher import AhoCorasick
+from utils.medication.fuzzy_index import DEFAULT_THRESHOLD, TrigramIndex
+
+CATALOG_REFRESH_SECONDS = float(os.environ.get("CATALOG_REFRESH_SECONDS", "30"))
+FUZZY_THRESHOLD = float(os.environ.get("MEDICATION_FUZZY_THRESHOLD", str(DEFAULT_THRESHOLD)))
+
+# Skip very short words like "do", "you", "in"
+MIN_WORD_LENGTH = 3
+# Typo matching on shorter words produces too many false positives
+MIN_FUZZY_WORD_LENGTH = 4
+# Everyday chat words that are never worth a typo match
+FUZZY_SKIP_WORDS = frozenset({
+    "about", "available", "branch", "does", "dosage", "dose", "from", "have",
+    "hello", "information", "much", "need", "please", "prescription", "refill",
+    "side", "stock", "store", "support", "take", "tell", "thank", "thanks",
+    "that", "there", "this", "what", "when", "where", "which", "with", "would",
+})
+
+# One-letter Hebrew prefixes glued to the next word: ו ה ב ל מ ש כ ("האקמול", "באקמול")
+HEBREW_PREFIXES = frozenset("והבלמשכ")
+MAX_HEBREW_PREFIXES = 2
+
+# Niqqud / cantillation marks, and quote characters used as geresh (גלוקופאג')
+_DIACRITICS = re.compile(r"[\u0591-\u05C7]")
+_QUOTES = re.compile(r"[\"'`\u05F3\u05F4\u2018\u2019\u201C\u201D]")
+_NON_WORD = re.compile(r"[\W_]+")
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop diacritics and quotes, turn other punctuation into spaces."""
+    text = _DIACRITICS.sub("", (text or "").lower())
+    text = _QUOTES.sub("", text)
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def _is_hebrew(ch: str) -> bool:
+    return "\u05D0" <= ch <= "\u05EA"
+
+
+def _fuzzy_variants(word: str) -> list[str]:
+    """`word`, plus the word without Hebrew one-letter prefixes ("בנורפן" -> "נורפן")."""
+    variants = [word]
+    for i in range(MAX_HEBREW_PREFIXES):
+        if not _is_hebrew(word[i]) or word[i] not in HEBREW_PREFIXES:
+            break
+        if len(word) - i - 1 < MIN_FUZZY_WORD_LENGTH:
+            break
+        variants.append(word[i + 1:])
+    return variants
+
+
+def _name_tokens(value: str | None) -> list[str]:
+    """Index keys for a name: the whole normalized name plus each of its words."""
+    whole = normalize(value)
+    if not whole:
+        return []
+    keys = [whole] + [w for w in whole.split() if w != whole]
+    return [k for k in keys if len(k) >= MIN_WORD_LENGTH]
+
+
+def _to_record(row) -> dict:
+    return {
+        "id": row["id"],
+        "name": row["brand_name"],
+        "generic_name": row["generic_name"],
+        "active_ingredient": row["active_ingredient"],
+        "rx_required": bool(row["rx_required"]),
+        "form": row["form"],
+        "strength": row["strength"],
+        "label_instructions_en": row["label_instructions"],
+        "warnings_en": row["warnings"]
+    }
+
+
+def _starts_word(text: str, start: int) -> bool:
+    """True if a match at `start` begins a word (allowing Hebrew one-letter prefixes)."""
+    if start == 0 or text[start - 1] == " ":
+        return True
+    if not _is_hebrew(text[start]):
+        return False
+
+    i = start
+    for _ in range(MAX_HEBREW_PREFIXES):
+        if text[i - 1] not in HEBREW_PREFIXES:
+            return False
+        i -= 1
+        if i == 0 or text[i - 1] == " ":
+            return True
+    return False
+
+
+class _Index:
+    """Immutable snapshot of the catalog; replaced wholesale on refresh."""
+
+    def __init__(
+        self,
+        records: list[dict],
+        aliases: list[tuple[str, str]],
+        version,
+        fuzzy_threshold: float = FUZZY_THRESHOLD,
+    ):
+        self.version = version
+        self.records = records
+        self.alias_count = len(aliases)
+        by_id = {r["id"]: r for r in records}
+
+        # Every name / alias -> record, matched in one pass over the message.
+        # Identical spans resolve to the record registered first; brand names
+        # are registered before generic names, active ingredients and aliases.
+        self.matcher = AhoCorasick()
+        self.fuzzy = TrigramIndex(fuzzy_threshold)
+        self._priority: dict[int, int] = {}
+
+        def register(key: str, record: dict, fuzzy: bool):
+            self.matcher.add(key, record)
+            self._priority.setdefault(id(record), len(self._priority))
+            if fuzzy:
+                self.fuzzy.add(key, record)
+
+        for field in ("name", "generic_name", "active_ingredient"):
+            for record in records:
+                for key in _name_tokens(record[field]):
+                    register(key, record, fuzzy=field != "active_ingredient")
+
+        for alias, medication_id in aliases:
+            record = by_id.get(medication_id)
+            if record is None:
+                continue
+            for key in _name_tokens(alias):
+                register(key, record, fuzzy=True)
+
+        self.matcher.build()
+
+        # Lowercased brand / generic names in id order, plus trigram postings
+        # into that list, for substring matches without scanning every name
+        self.names: list[tuple[str, dict]] = []
+        self.name_postings: dict[str, list[int]] = {}
+        for record in records:
+            for field in ("name", "generic_name"):
+                name = (record[field] or "").lower()
+                slot = len(self.names)
+                self.names.append((name, record))
+                for gram in {name[i:i + 3] for i in range(len(name) - 2)}:
+                    self.name_postings.setdefault(gram, []).append(slot)
+
+    def mentions(self, text: str) -> list[tuple[int, int, dict]]:
+        """
+        Whole-word name / alias mentions in normalized `text`, leftmost-longest
+        and non-overlapping, as (start, end, record).
+        """
+        found = []
+        for start, end, record in self.matcher.iter_matches(text):
+            if end < len(text) and text[end] != " ":
+                continue
+            if not _starts_word(text, start):
+                continue
+            found.append((start, end, record))
+
+        found.sort(key=lambda m: (m[0], -(m[1] - m[0]), self._priority[id(m[2])]))
+
+        selected = []
+        last_end = -1
+        for start, end, record in found:
+            if start < last_end:
+                continue
+            selected.append((start, end, record))
+            last_end = end
+        return selected
+
+    def substring_match(self, word: str) -> dict | None:
+        """First medication (in id order) whose brand or generic name contains `word`."""
+        postings = self.name_postings
+        lists = [postings.get(word[i:i + 3]) for i in range(len(word) - 2)]
+        if not lists or not all(lists):
+            return None
+
+        # Any containing name is in every list; walk the shortest one in order
+        for slot in min(lists, key=len):
+            name, record = self.names[slot]
+            if word in name:
+                return record
+        return None
+
+
+class MedicationCatalog:
+
+    def __init__(self, refresh_interval: float = CATALOG_REFRESH_SECONDS):
+        self.refresh_interval = refresh_interval
+        self._index: _Index | None = None
+        self._load_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self.loads = 0
+        self.lookups = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.last_load_ms = 0.0
+
+    # ---- Loading ----
+
+    def _read_version(self, c):
+        try:
+            row = c.execute("SELECT version FROM catalog_version WHERE id = 1").fetchone()
+            return row[0] if row else None
+        except Exception:
+            # Database not migrated yet - fall back to reloading on every refresh
+            return None
+
+    def _read_aliases(self, c) -> list[tuple[str, str]]:
+        try:
+            rows = c.execute(
+                "SELECT alias, medication_id FROM medication_aliases ORDER BY medication_id, alias"
+            ).fetchall()
+        except Exception:
+            return []
+        return [(row["alias"], row["medication_id"]) for row in rows]
+
+    def load(self) -> None:
+        """(Re)load the whole catalog from the database."""
+        with self._load_lock:
+            started = time.perf_counter()
+            with connection() as c:
+                version = self._read_version(c)
+                rows = c.execute("SELECT * FROM medications ORDER BY id").fetchall()
+                aliases = self._read_aliases(c)
+
+            self._index = _Index([_to_record(r) for r in rows], aliases, version)
+            self.loads += 1
+            self.last_load_ms = (time.perf_counter() - started) * 1000
+
+        logger.info(
+            "Medication catalog loaded: %d medications, %d aliases (version %s) in %.1fms",
+            len(rows), len(aliases), version, self.last_load_ms,
+        )
+
+    def refresh_if_changed(self) -> bool:
+        """Reload when catalog_version moved. Returns True if reloaded."""
+        with connection() as c:
+            version = self._read_version(c)
+
+        index = self._index
+        if index is not None and version is not None and version == index.version:
+            return False
+
+        self.load()
+        return True
+
+    @property
+    def version(self):
+        """catalog_version of the loaded snapshot (None if not loaded / unmigrated)."""
+        index = self._index
+        return index.version if index else None
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next lookup reloads it."""
+        self._index = None
+
+    def _get_index(self) -> _Index:
+        index = self._index
+        if index is None:
+            with self._load_lock:
+                if self._index is None:
+                    self.load()
+                index = self._index
+        return index
+
+    # ---- Background refresh ----
+
+    def start_refresher(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop, name="catalog-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop_refresher(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh_if_changed()
+            except Exception:
+                logger.exception("Medication catalog refresh failed")
+
+    # ---- Lookups ----
+
+    def find_all(self, message: str) -> list[dict]:
+        """Every medication mentioned by name or alias, in order of first mention."""
+        index = self._get_index()
+        seen, found = set(), []
+        for _, _, record in index.mentions(normalize(message)):
+            if record["id"] not in seen:
+                seen.add(record["id"])
+                found.append(dict(record))
+        return found
+
+    def resolve(self, message: str) -> dict | None:
+        """
+        Find the medication a message is about, in one pass over its text:
+        the first whole-word name / alias mention (any language), else the
+        old substring match against brand and generic names, else the closest
+        typo-tolerant (trigram) match above the threshold.
+        """
+        index = self._get_index()
+        self.lookups += 1
+
+        text = normalize(message)
+        mentions = index.mentions(text)
+        if mentions:
+            return dict(mentions[0][2])
+
+        words = text.split()
+        for word in words:
+            if len(word) < MIN_WORD_LENGTH:
+                continue
+            record = index.substring_match(word)
+            if record is not None:
+                return dict(record)
+
+        best_score, best_record = 0.0, None
+        for word in words:
+            if len(word) < MIN_FUZZY_WORD_LENGTH or word in FUZZY_SKIP_WORDS:
+                continue
+            # Fuzzy keys must share the first letter, so try without glued prefixes too
+            for variant in _fuzzy_variants(word):
+                for score, record in index.fuzzy.search(variant):
+                    if score > best_score:
+                        best_score, best_record = score, record
+
+        if best_record is not None:
+            self.fuzzy_hits += 1
+            return dict(best_record)
+
+        self.misses += 1
+        return None
+
+    def stats(self) -> dict:
+        index = self._index
+        return {
+            "loaded": index is not None,
+            "version": index.version if index else None,
+            "medications": len(index.records) if index else 0,
+            "aliases": index.alias_count if index else 0,
+            "loads": self.loads,
+            "last_load_ms": round(self.last_load_ms, 3),
+            "lookups": self.lookups,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+        }
+
+
+_CATALOG: MedicationCatalog | None = None
+_CATALOG_LOCK = threading.Lock()
+
+
+def get_catalog() -> MedicationCatalog:
+    global _CATALOG
+    if _CATALOG is None:
+        with _CATALOG_LOCK:
+            if _CATALOG is None:
+                _CATALOG = MedicationCatalog()
+    return _CATALOG
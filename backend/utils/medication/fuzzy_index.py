@@ -0,0 +1,131 @@
+"""
+Character-trigram similarity index for typo-tolerant name matching
+("nurofn" -> Nurofen, "ibuprofin" -> Ibuprofen).
+
+Similarity is the Dice coefficient over padded trigram sets:
+2 * shared / (|query| + |key|). Postings are partitioned by the key's
+first letter and trigram count, so within one partition the best key is
+simply the one sharing the most trigrams with the query. Partitions whose
+size cannot reach the threshold are skipped entirely, as are partitions
+holding too few of the query's trigrams. Otherwise only keys found in the
+shortest posting lists can reach the threshold (prefix filtering), so just
+those are verified instead of counting every posting.
+
+Only keys starting with the query's first letter are candidates. Typos
+rarely hit the first letter, while unrelated words that merely share an
+ending ("arrived" / "kirived", "credit" / "vuredit") score as high as real
+typos on Dice alone. A match must also share at least `min_shared`
+trigrams, so very short words cannot match on one or two.
+"""
+
+import math
+from itertools import chain
+
+DEFAULT_THRESHOLD = 0.55
+DEFAULT_MIN_SHARED = 3
+
+
+def trigrams(text: str) -> frozenset[str]:
+    padded = f"${text}$"
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _needed(threshold: float, total: int) -> int:
+    """Fewest shared trigrams with 2 * shared / total >= threshold."""
+    need = math.ceil(threshold * total / 2)
+    # Float rounding can push an exact product just past an integer
+    return need - 1 if need and 2 * (need - 1) / total >= threshold else need
+
+
+class TrigramIndex:
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, min_shared: int = DEFAULT_MIN_SHARED):
+        self.threshold = threshold
+        self.min_shared = min_shared
+        self._slots: dict[str, int] = {}
+        # slot -> key
+        self._keys: list[str] = []
+        # slot -> every value indexed under that key
+        self._values: list[list] = []
+        # first letter -> key trigram count -> trigram -> slots
+        self._postings: dict[str, dict[int, dict[str, list[int]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, key: str, value) -> None:
+        """Index `key` (already normalized) as pointing at `value`."""
+        if not key:
+            return
+
+        slot = self._slots.get(key)
+        if slot is not None:
+            values = self._values[slot]
+            if not any(v is value for v in values):
+                values.append(value)
+            return
+
+        slot = len(self._values)
+        self._slots[key] = slot
+        self._keys.append(key)
+        self._values.append([value])
+
+        grams = trigrams(key)
+        partition = self._postings.setdefault(key[0], {}).setdefault(len(grams), {})
+        for gram in grams:
+            partition.setdefault(gram, []).append(slot)
+
+    def search(self, query: str, threshold: float | None = None, limit: int = 1) -> list[tuple[float, object]]:
+        """
+        Best matches for `query` as (score, value), highest score first.
+        Ties go to the key indexed first, independent of hash seeds.
+        """
+        t = self.threshold if threshold is None else threshold
+        grams = trigrams(query)
+        n = len(grams)
+        if not query or not n:
+            return []
+        by_size = self._postings.get(query[0])
+        if not by_size:
+            return []
+
+        # Key sizes that can reach the threshold at all
+        min_size = math.ceil(t * n / (2 - t))
+        max_size = math.floor(n * (2 - t) / t)
+
+        scored: list[tuple[float, int]] = []
+        for size, partition in by_size.items():
+            if size < min_size or size > max_size:
+                continue
+
+            lists = [partition[g] for g in grams if g in partition]
+            need = max(self.min_shared, _needed(t, n + size))
+            if len(lists) < need:
+                continue
+
+            # A key sharing `need` trigrams is missing from at most
+            # len(lists) - need of the lists, so it is in one of the
+            # len(lists) - need + 1 shortest ones
+            lists.sort(key=len)
+            candidates = []
+            for slot in set(chain.from_iterable(lists[:len(lists) - need + 1])):
+                shared = len(grams & trigrams(self._keys[slot]))
+                if shared >= need:
+                    candidates.append((-shared, slot))
+
+            # Explicit order rather than set iteration order, which changes
+            # with the hash seed
+            candidates.sort()
+            for neg_shared, slot in candidates[:limit]:
+                scored.append((-2 * neg_shared / (n + size), slot))
+
+        # Highest score first; ties go to the key indexed first
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        results = []
+        for score, slot in scored:
+            for value in self._values[slot]:
+                results.append((score, value))
+                if len(results) >= limit:
+                    return results
+        return results
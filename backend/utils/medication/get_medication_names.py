@@ -0,0 +1,34 @@
+from utils.db.db import connection
+
+# Stay well below SQLite's bound-parameter limit
+_CHUNK_SIZE = 500
+
+
+def get_medication_names(medication_ids) -> dict[str, str]:
+    """
+    Resolve display names for many medications with one IN (...) query
+    (chunked for very large inputs).
+    Returns {medication_id: brand_name or generic_name}; unknown ids are omitted.
+    """
+    ids = sorted({mid for mid in medication_ids if mid})
+    if not ids:
+        return {}
+
+    names = {}
+    with connection() as c:
+        cur = c.cursor()
+        for start in range(0, len(ids), _CHUNK_SIZE):
+            chunk = ids[start:start + _CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cur.execute(
+                f"""
+                SELECT id, brand_name, generic_name
+                FROM medications
+                WHERE id IN ({placeholders})
+                """,
+                chunk,
+            )
+            for row in cur.fetchall():
+                names[row["id"]] = row["brand_name"] or row["generic_name"] or row["id"]
+
+    return names
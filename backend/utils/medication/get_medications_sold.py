@@ -1,35 +1,34 @@
-from utils.db.db import conn
+from utils.db.db import connection
 
 
 def get_medications_sold():
     """
     Get all medications sold with medication details joined
     """
-    c = conn()
-    cur = c.cursor()
-
-    cur.execute("""
-        SELECT 
-            ms.id,
-            ms.medication_id,
-            m.brand_name,
-            m.generic_name,
-            ms.user_id,
-            ms.prescription_id,
-            ms.quantity,
-            ms.unit_price,
-            ms.total_price,
-            ms.sold_at,
-            ms.sold_year,
-            ms.sold_month,
-            ms.sold_day
-        FROM medications_sold ms
-        LEFT JOIN medications m ON ms.medication_id = m.id
-        ORDER BY ms.sold_at ASC
-    """)
-
-    rows = cur.fetchall()
-    c.close()
+    with connection() as c:
+        cur = c.cursor()
+
+        cur.execute("""
+            SELECT 
+                ms.id,
+                ms.medication_id,
+                m.brand_name,
+                m.generic_name,
+                ms.user_id,
+                ms.prescription_id,
+                ms.quantity,
+                ms.unit_price,
+                ms.total_price,
+                ms.sold_at,
+                ms.sold_year,
+                ms.sold_month,
+                ms.sold_day
+            FROM medications_sold ms
+            LEFT JOIN medications m ON ms.medication_id = m.id
+            ORDER BY ms.sold_at ASC
+        """)
+
+        rows = cur.fetchall()
 
     # Convert to list of dicts and add medication_name field
     result = []
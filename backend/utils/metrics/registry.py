@@ -0,0 +1,99 @@
+"""
+Minimal in-process metrics: counters and fixed-bucket histograms.
+
+Everything is exposed through `snapshot()`, which the /metrics endpoint
+returns as JSON. Values are per worker process.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in milliseconds
+DEFAULT_MS_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Counter:
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Histogram:
+
+    def __init__(self, buckets=DEFAULT_MS_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[slot] += 1
+            self._count += 1
+            self._sum += value
+            self._max = max(self._max, value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"le_{b:g}" for b in self.buckets] + ["inf"]
+            return {
+                "count": self._count,
+                "sum": round(self._sum, 3),
+                "avg": round(self._sum / self._count, 3) if self._count else 0.0,
+                "max": round(self._max, 3),
+                "buckets": dict(zip(labels, self._counts)),
+            }
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._counters: dict[str, Counter] = {}
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str) -> Counter:
+        metric = self._counters.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._counters.setdefault(name, Counter())
+        return metric
+
+    def histogram(self, name: str, buckets=DEFAULT_MS_BUCKETS) -> Histogram:
+        metric = self._histograms.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._histograms.setdefault(name, Histogram(buckets))
+        return metric
+
+    @contextmanager
+    def timer(self, name: str):
+        """Observe the duration of the `with` block (ms) into histogram `name`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name).observe((time.perf_counter() - started) * 1000)
+
+    def snapshot(self) -> dict:
+        return {
+            "counters": {name: c.value for name, c in sorted(self._counters.items())},
+            "histograms": {name: h.snapshot() for name, h in sorted(self._histograms.items())},
+        }
+
+
+METRICS = MetricsRegistry()
@@ -0,0 +1,55 @@
+"""
+Startup phase tracking for the /ready endpoint.
+
+Each phase records its duration and outcome; the service is ready once
+every expected phase has finished successfully.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTracker:
+
+    def __init__(self, phases: tuple[str, ...]):
+        self.expected = tuple(phases)
+        self.phases: dict[str, dict] = {name: {"status": "pending"} for name in phases}
+        self.started_at = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a startup phase; failures are recorded and re-raised."""
+        with self._lock:
+            self.phases[name] = {"status": "running"}
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            elapsed = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self.phases[name] = {"status": "failed", "ms": round(elapsed, 1), "error": str(e)}
+            logger.exception("Startup phase %s failed after %.1fms", name, elapsed)
+            raise
+
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.phases[name] = {"status": "ok", "ms": round(elapsed, 1)}
+        logger.info("Startup phase %s done in %.1fms", name, elapsed)
+
+    @property
+    def ready(self) -> bool:
+        return all(self.phases.get(name, {}).get("status") == "ok" for name in self.expected)
+
+    def report(self) -> dict:
+        with self._lock:
+            phases = {name: dict(info) for name, info in self.phases.items()}
+        return {
+            "ready": self.ready,
+            "uptime_s": round(time.perf_counter() - self.started_at, 1),
+            "phases": phases,
+        }
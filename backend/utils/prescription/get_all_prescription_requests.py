@@ -1,15 +1,41 @@
-from utils.db.db import conn
+from utils.db.db import connection
+from utils.db.pagination import build_page_query
 
-def get_all_prescription_requests():
-    c = conn()
-    cur = c.cursor()
+def get_all_prescription_requests(
+    status: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+    after: tuple[str, str] | None = None,
+):
+    where, params = [], []
+    if status:
+        where.append("pr.status = ?")
+        params.append(status)
 
-    cur.execute("""
-        SELECT *
-        FROM prescription_requests
-        ORDER BY created_at DESC
-    """)
+    tail, params = build_page_query(where, params, after, limit, offset, prefix="pr.")
 
-    rows = cur.fetchall()
-    c.close()
+    with connection() as c:
+        cur = c.cursor()
+
+        # Medication name is joined in so callers never look it up per row
+        cur.execute("""
+            SELECT
+                pr.*,
+                COALESCE(m.brand_name, m.generic_name, pr.medication_id) AS medication_name
+            FROM prescription_requests pr
+            LEFT JOIN medications m ON m.id = pr.medication_id
+        """ + tail, params)
+
+        rows = cur.fetchall()
     return [dict(row) for row in rows]
+
+
+def count_all_prescription_requests(status: str | None = None) -> int:
+    sql = "SELECT COUNT(*) FROM prescription_requests"
+    params = []
+    if status:
+        sql += " WHERE status = ?"
+        params.append(status)
+
+    with connection() as c:
+        return c.execute(sql, params).fetchone()[0]
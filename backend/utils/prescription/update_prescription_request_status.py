@@ -1,22 +1,20 @@
-from utils.db.db import conn
+from utils.db.db import connection
 from fastapi import HTTPException
 
 def update_prescription_request_status(prescription_id: str, status: str):
-    c = conn()
-    cur = c.cursor()
+    with connection() as c:
+        cur = c.cursor()
 
-    cur.execute(
-        """
-        UPDATE prescription_requests
-        SET status = ?
-        WHERE id = ?
-        """,
-        (status, prescription_id),
-    )
+        cur.execute(
+            """
+            UPDATE prescription_requests
+            SET status = ?
+            WHERE id = ?
+            """,
+            (status, prescription_id),
+        )
 
-    if cur.rowcount == 0:
-        c.close()
-        raise HTTPException(status_code=404, detail="Prescription not found")
+        if cur.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Prescription not found")
 
-    c.commit()
-    c.close()
+        c.commit()
@@ -1,15 +1,14 @@
-from utils.db.db import conn
+from utils.db.db import connection
 
 def get_all_support_requests():
-    c = conn()
-    cur = c.cursor()
+    with connection() as c:
+        cur = c.cursor()
 
-    cur.execute("""
-        SELECT *
-        FROM support_requests
-        ORDER BY created_at DESC
-    """)
+        cur.execute("""
+            SELECT *
+            FROM support_requests
+            ORDER BY created_at DESC
+        """)
 
-    rows = cur.fetchall()
-    c.close()
+        rows = cur.fetchall()
     return [dict(row) for row in rows]
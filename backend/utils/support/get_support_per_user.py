@@ -1,27 +1,38 @@
-from utils.db.db import conn
+from utils.db.db import connection
+from utils.db.pagination import build_page_query
 
-def get_support_per_user(user_id: str):
+def get_support_per_user(
+    user_id: str,
+    status: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+    after: tuple[str, str] | None = None,
+):
     try:
-        c = conn()
-        cur = c.cursor()
-
-        cur.execute(
-            """
-            SELECT
-              id,
-              subject,
-              message,
-              status,  
-              created_at
-            FROM support_requests
-            WHERE user_id = ?
-            ORDER BY created_at DESC
-            """,
-            (user_id,),
-        )
-
-        rows = cur.fetchall()
-        c.close()
+        where, params = ["user_id = ?"], [user_id]
+        if status:
+            where.append("status = ?")
+            params.append(status)
+
+        tail, params = build_page_query(where, params, after, limit, offset)
+
+        with connection() as c:
+            cur = c.cursor()
+
+            cur.execute(
+                """
+                SELECT
+                  id,
+                  subject,
+                  message,
+                  status,  
+                  created_at
+                FROM support_requests
+                """ + tail,
+                params,
+            )
+
+            rows = cur.fetchall()
 
         return [
             {
@@ -38,3 +49,14 @@ def get_support_per_user(user_id: str):
 
     except Exception as e:
         return []
+
+
+def count_support_per_user(user_id: str, status: str | None = None) -> int:
+    sql = "SELECT COUNT(*) FROM support_requests WHERE user_id = ?"
+    params = [user_id]
+    if status:
+        sql += " AND status = ?"
+        params.append(status)
+
+    with connection() as c:
+        return c.execute(sql, params).fetchone()[0]
@@ -1,23 +1,22 @@
-from utils.db.db import conn
+from utils.db.db import connection
 
 
 def fetch_users():
     """
     Fetch all users for UI selection.
     """
-    c = conn()
-    cur = c.cursor()
+    with connection() as c:
+        cur = c.cursor()
 
-    cur.execute(
-        """
-        SELECT id, full_name, phone, preferred_lang, role
-        FROM users
-        ORDER BY full_name
-        """
-    )
+        cur.execute(
+            """
+            SELECT id, full_name, phone, preferred_lang, role
+            FROM users
+            ORDER BY full_name
+            """
+        )
 
-    rows = cur.fetchall()
-    c.close()
+        rows = cur.fetchall()
 
     if not rows:
         return []
@@ -1,4 +1,4 @@
-from utils.db.db import conn
+from utils.db.db import connection
 
 
 def get_user_by_id(user_id: str) -> dict | None:
@@ -6,30 +6,26 @@ def get_user_by_id(user_id: str) -> dict | None:
     Returns a single user by ID or None if not found.
     """
     try:
-        c = conn()
-        c.row_factory = lambda cursor, row: {
-            col[0]: row[idx] for idx, col in enumerate(cursor.description)
-        }
-        cur = c.cursor()
+        with connection() as c:
+            cur = c.cursor()
 
-        cur.execute(
-            """
-            SELECT
-              id,
-              full_name,
-              phone,
-              preferred_lang,
-              role
-            FROM users
-            WHERE id = ?
-            """,
-            (user_id,),
-        )
+            cur.execute(
+                """
+                SELECT
+                  id,
+                  full_name,
+                  phone,
+                  preferred_lang,
+                  role
+                FROM users
+                WHERE id = ?
+                """,
+                (user_id,),
+            )
 
-        row = cur.fetchone()
-        c.close()
+            row = cur.fetchone()
 
-        return row  # dict or None
+        return dict(row) if row else None
 
     except Exception as e:
         # optionally log this
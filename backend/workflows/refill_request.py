@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from utils.db.db import conn
+from utils.db.db import connection
 from utils.logging_utils.workflow_logger import get_workflow_logger
 
 def handle(message: str, user_id: str | None = None):
@@ -19,75 +19,72 @@ def handle(message: str, user_id: str | None = None):
     status = "pending"
 
     try:
-        c = conn()
-        cur = c.cursor()
-
-        cur.execute(
-            """
-            SELECT id, medication_id, refills_left, expires_on
-            FROM prescriptions
-            WHERE user_id = ?
-              AND status = 'active'
-            LIMIT 1
-            """,
-            (user_id,)
-        )
-
-        prescription = cur.fetchone()
-
-        if not prescription:
-            c.close()
-            return {
-                "type": "refill_request",
-                "context": (
-                    "**Refill request denied**\n\n"
-                    "You do not have an active prescription on file.\n"
-                    "Please contact your pharmacist or doctor."
-                )
-            }
-
-        prescription_id, medication_id, refills_left, expires_on = prescription
+        with connection() as c:
+            cur = c.cursor()
+
+            cur.execute(
+                """
+                SELECT id, medication_id, refills_left, expires_on
+                FROM prescriptions
+                WHERE user_id = ?
+                  AND status = 'active'
+                LIMIT 1
+                """,
+                (user_id,)
+            )
 
-        if refills_left is None or refills_left <= 0:
-            c.close()
-            return {
-                "type": "refill_request",
-                "context": (
-                    "**No refills remaining**\n\n"
-                    "Your prescription has no refills left.\n"
-                    "Please contact your doctor."
+            prescription = cur.fetchone()
+
+            if not prescription:
+                return {
+                    "type": "refill_request",
+                    "context": (
+                        "**Refill request denied**\n\n"
+                        "You do not have an active prescription on file.\n"
+                        "Please contact your pharmacist or doctor."
+                    )
+                }
+
+            prescription_id, medication_id, refills_left, expires_on = prescription
+
+            if refills_left is None or refills_left <= 0:
+                return {
+                    "type": "refill_request",
+                    "context": (
+                        "**No refills remaining**\n\n"
+                        "Your prescription has no refills left.\n"
+                        "Please contact your doctor."
+                    )
+                }
+
+            cur.execute(
+                """
+                INSERT INTO prescription_requests
+                (id, user_id, medication_id, request_type, status, notes, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    request_id,
+                    user_id,
+                    medication_id,
+                    "refill",
+                    status,
+                    message,
+                    created_at,
                 )
-            }
-
-        cur.execute(
-            """
-            INSERT INTO prescription_requests
-            (id, user_id, medication_id, request_type, status, notes, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                request_id,
-                user_id,
-                medication_id,
-                "refill",
-                status,
-                message,
-                created_at,
             )
-        )
 
-        # ➖ 3. Deduct one refill
-        cur.execute(
-            """
-            UPDATE prescriptions
-            SET refills_left = refills_left - 1
-            WHERE id = ?
-            """,
-            (prescription_id,)
-        )
+            # ➖ 3. Deduct one refill
+            cur.execute(
+                """
+                UPDATE prescriptions
+                SET refills_left = refills_left - 1
+                WHERE id = ?
+                """,
+                (prescription_id,)
+            )
 
-        c.commit()
-        c.close()
+            c.commit()
 
         logger.info("Refill request created and refill deducted: %s", request_id)
 
@@ -114,11 +111,6 @@ def handle(message: str, user_id: str | None = None):
 
     except Exception:
         logger.exception("Failed to create refill request")
-        try:
-            c.rollback()
-            c.close()
-        except Exception:
-            pass
 
         return {
             "type": "refill_request",
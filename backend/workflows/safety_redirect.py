@@ -1,5 +1,6 @@
 def handle(user_message: str, user_id: str | None = None):
     return {
+        "type": "safety_redirect",
         "context": """
 I can provide general factual information about medications,
 but I can’t give medical advice or treatment recommendations.
@@ -1,5 +1,5 @@
 # workflows/inventory.py
-from utils.db.db import conn
+from utils.db.db import connection
 from utils.medication.fetch_medication import get_medication_by_name
 from utils.logging_utils.workflow_logger import get_workflow_logger
 
@@ -79,34 +79,30 @@ def check_stock_per_store(medication_id: str, user_id: str | None = None) -> lis
     """
     Return stock levels for a medication across all stores.
     """
-    # logger = get_workflow_logger(user_id)
+    logger = get_workflow_logger(user_id)
     logger.info("Checking stock per store for medication_id=%s", medication_id)
 
-    c = None
     try:
-        c = conn()
-        cur = c.cursor()
-
-        cur.execute(
-            """
-            SELECT store_id, quantity
-            FROM stock
-            WHERE medication_id = ?
-            ORDER BY store_id
-            """,
-            (medication_id,),
-        )
+        with connection() as c:
+            cur = c.cursor()
+
+            cur.execute(
+                """
+                SELECT store_id, quantity
+                FROM stock
+                WHERE medication_id = ?
+                ORDER BY store_id
+                """,
+                (medication_id,),
+            )
 
-        rows = cur.fetchall()
+            rows = cur.fetchall()
     except Exception:
         logger.exception(
             "Database error while fetching stock for medication_id=%s",
             medication_id,
         )
         raise
-    finally:
-        if c:
-            c.close()
 
     if not rows:
         return []
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from utils.db.db import conn
+from utils.db.db import connection
 from utils.logging_utils.workflow_logger import get_workflow_logger
 
 
@@ -24,27 +24,26 @@ def handle(message: str, user_id: str | None = None):
     status = "open"
 
     try:
-        c = conn()
-        cur = c.cursor()
+        with connection() as c:
+            cur = c.cursor()
 
-        cur.execute(
-            """
-            INSERT INTO support_requests
-            (id, user_id, subject, message, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                request_id,
-                user_id,
-                message,
-                message,
-                status,
-                created_at,
+            cur.execute(
+                """
+                INSERT INTO support_requests
+                (id, user_id, subject, message, status, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    request_id,
+                    user_id,
+                    message,
+                    message,
+                    status,
+                    created_at,
+                )
             )
-        )
 
-        c.commit()
-        c.close()
+            c.commit()
 
         logger.info("Support request created: %s", request_id)
 